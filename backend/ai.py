@@ -330,14 +330,11 @@ def generate_weekly_fitness_plan(user_profile, base_recommendation):
         enable_agentic_rag = os.getenv("ENABLE_AGENTIC_RAG", "false").lower() == "true"
         
         if enable_agentic_rag:
-            from vector_store import FitnessVectorStore
+            from vector_store import vector_store
             from mcp_client import get_fallback_fitness_recommendation
             
             logging.info("🔍 Fetching specific exercises from ChromaDB for weekly plan")
             
-            # Initialize ChromaDB
-            vector_store = FitnessVectorStore()
-            
             # Search for exercises based on agent type
             search_terms = {
                 'weight_loss': ['cardio exercises', 'fat burning workouts', 'HIIT exercises'],
@@ -17,7 +17,7 @@ from voice_chat import voice_chat_bp, store_user_data_in_azure_search, store_wee
 from vector_store import vector_store
 from auth_utils import (
     PasswordHasher, TokenManager, Validator, 
-    require_auth, optional_auth, email_to_search_id
+    require_auth, optional_auth, require_sync_token, email_to_search_id
 )
 from input_validator import InputValidator
 
@@ -331,8 +331,6 @@ def get_weekly_plan():
         logging.info(f"Fetching weekly plan from ChromaDB for: {user_email}")
         
         # Get weekly plan from ChromaDB
-        from vector_store import FitnessVectorStore
-        vector_store = FitnessVectorStore()
         weekly_plan = vector_store.get_weekly_plan(user_email)
         
         if weekly_plan:
@@ -368,8 +366,6 @@ def delete_weekly_plan():
         logging.info(f"Deleting weekly plan from ChromaDB for: {user_email}")
         
         # Delete weekly plan from ChromaDB
-        from vector_store import FitnessVectorStore
-        vector_store = FitnessVectorStore()
         success = vector_store.delete_weekly_plan(user_email)
         
         if success:
@@ -429,8 +425,6 @@ def generate_weekly_plan():
         user_email = user_profile.get('email')
         if user_email and user_email.strip():
             try:
-                from vector_store import FitnessVectorStore
-                vector_store = FitnessVectorStore()
                 vector_store.store_weekly_plan(user_email, weekly_plan)
                 logging.info(f"✅ Successfully stored weekly plan in ChromaDB for {user_email}")
             except Exception as e:
@@ -535,9 +529,8 @@ def identify_food():
         image_file = request.files['image']
         
         # Validate file
-        allowed_extensions = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp']
         is_valid, error = InputValidator.validate_file_upload(
-            image_file, 'Image', allowed_extensions, max_size_mb=10
+            image_file, 'Image', InputValidator.ALLOWED_IMAGE_EXTENSIONS, max_size_mb=10
         )
         if not is_valid:
             logging.warning(f"File validation failed: {error}")
@@ -616,6 +609,105 @@ def video_feed():
 def favicon():
     return '', 204
 
+def build_user_profile_data(data):
+    """
+    Validate a create-user-profile payload and build the ChromaDB record (password hashed)
+    Returns (vector_data, None), or (None, error message) when the payload is invalid
+    """
+    email = data.get('email')
+    password = data.get('password', '')
+    
+    logging.info(f"Creating user profile for: {email}")
+    
+    # Validate email format
+    is_valid_email, email_or_error = Validator.validate_email_format(email)
+    if not is_valid_email:
+        return None, email_or_error
+    
+    email = email_or_error  # Use normalized email
+    
+    # Validate password strength
+    is_valid_password, password_error = Validator.validate_password_strength(password)
+    if not is_valid_password:
+        logging.warning(f"Password validation failed for {email}: {password_error}")
+        return None, password_error
+    
+    # Validate name
+    first_name = InputValidator.sanitize_text(data.get('firstName', ''), InputValidator.MAX_NAME_LENGTH)
+    last_name = InputValidator.sanitize_text(data.get('lastName', ''), InputValidator.MAX_NAME_LENGTH)
+    
+    if not data.get('name') and not first_name and not last_name:
+        return None, 'Name is required (either name or firstName/lastName)'
+    
+    # Validate age if provided
+    age_value = data.get('age')
+    if age_value:
+        is_valid, error, age_int = InputValidator.validate_integer(
+            age_value, 'Age', InputValidator.AGE_MIN, InputValidator.AGE_MAX
+        )
+        if not is_valid:
+            return None, error
+    
+    # Validate weight if provided
+    weight_value = data.get('weight')
+    if weight_value:
+        is_valid, error, weight_float = InputValidator.validate_float(
+            weight_value, 'Weight', InputValidator.WEIGHT_MIN, InputValidator.WEIGHT_MAX
+        )
+        if not is_valid:
+            return None, error
+    
+    # Validate height if provided
+    height_value = data.get('height')
+    if height_value:
+        is_valid, error, height_float = InputValidator.validate_float(
+            height_value, 'Height', InputValidator.HEIGHT_MIN, InputValidator.HEIGHT_MAX
+        )
+        if not is_valid:
+            return None, error
+    
+    # Validate gender if provided
+    gender_value = data.get('gender') or data.get('sex', '')
+    if gender_value:
+        is_valid, error = InputValidator.validate_enum(
+            gender_value, 'Gender', InputValidator.ALLOWED_GENDERS
+        )
+        if not is_valid:
+            return None, error
+    
+    # Hash the password
+    hashed_password = PasswordHasher.hash_password(password)
+    
+    first_name = data.get('firstName', '')
+    last_name = data.get('lastName', '')
+    
+    if not data.get('name') and not first_name and not last_name:
+        return None, 'Name is required (either name or firstName/lastName)'
+    
+    # Handle name field (legacy) or new firstName/lastName fields
+    full_name = data.get('name')
+    if not full_name:
+        middle_name = data.get('middleName', '')
+        full_name = f"{first_name} {middle_name} {last_name}".strip()
+    
+    vector_data = {
+        'email': email,
+        'username': data.get('username', ''),
+        'firstName': first_name,
+        'middleName': data.get('middleName', ''),
+        'lastName': last_name,
+        'name': full_name,
+        'age': int(data.get('age', 0)) if data.get('age') else 0,
+        'weight': float(data.get('weight', 0)) if data.get('weight') else 0,
+        'height': float(data.get('height', 0)) if data.get('height') else 0,
+        'gender': data.get('gender') or data.get('sex', ''),
+        'fitnessLevel': data.get('fitnessLevel', ''),
+        'agentType': data.get('agentType') or data.get('fitnessAgent', 'personal_trainer'),
+        'medicalConditions': data.get('medicalConditions', []) if isinstance(data.get('medicalConditions'), list) else [],
+        'password': hashed_password  # Store hashed password in ChromaDB
+    }
+    return vector_data, None
+
 # User Management Endpoints
 @app.route('/api/create-user-profile', methods=['POST'])
 @limiter.limit("5 per minute")  # Rate limit registration
@@ -632,112 +724,16 @@ def create_user_profile():
                 'error': 'Request body is required'
             }), 400
         
-        email = data.get('email')
-        password = data.get('password', '')
-        
-        logging.info(f"Creating user profile for: {email}")
-        
-        # Validate email format
-        is_valid_email, email_or_error = Validator.validate_email_format(email)
-        if not is_valid_email:
-            return jsonify({
-                'success': False,
-                'error': email_or_error
-            }), 400
-        
-        email = email_or_error  # Use normalized email
-        
-        # Validate password strength
-        is_valid_password, password_error = Validator.validate_password_strength(password)
-        if not is_valid_password:
-            logging.warning(f"Password validation failed for {email}: {password_error}")
-            return jsonify({
-                'success': False,
-                'error': password_error
-            }), 400
-        
-        # Validate name
-        first_name = InputValidator.sanitize_text(data.get('firstName', ''), InputValidator.MAX_NAME_LENGTH)
-        last_name = InputValidator.sanitize_text(data.get('lastName', ''), InputValidator.MAX_NAME_LENGTH)
-        
-        if not data.get('name') and not first_name and not last_name:
+        vector_data, error = build_user_profile_data(data)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Name is required (either name or firstName/lastName)'
+                'error': error
             }), 400
-        
-        # Validate age if provided
-        age_value = data.get('age')
-        if age_value:
-            is_valid, error, age_int = InputValidator.validate_integer(
-                age_value, 'Age', InputValidator.AGE_MIN, InputValidator.AGE_MAX
-            )
-            if not is_valid:
-                return jsonify({'success': False, 'error': error}), 400
-        
-        # Validate weight if provided
-        weight_value = data.get('weight')
-        if weight_value:
-            is_valid, error, weight_float = InputValidator.validate_float(
-                weight_value, 'Weight', InputValidator.WEIGHT_MIN, InputValidator.WEIGHT_MAX
-            )
-            if not is_valid:
-                return jsonify({'success': False, 'error': error}), 400
-        
-        # Validate height if provided
-        height_value = data.get('height')
-        if height_value:
-            is_valid, error, height_float = InputValidator.validate_float(
-                height_value, 'Height', InputValidator.HEIGHT_MIN, InputValidator.HEIGHT_MAX
-            )
-            if not is_valid:
-                return jsonify({'success': False, 'error': error}), 400
-        
-        # Validate gender if provided
-        gender_value = data.get('gender') or data.get('sex', '')
-        if gender_value:
-            is_valid, error = InputValidator.validate_enum(
-                gender_value, 'Gender', InputValidator.ALLOWED_GENDERS
-            )
-            if not is_valid:
-                return jsonify({'success': False, 'error': error}), 400
-        
-        # Hash the password
-        hashed_password = PasswordHasher.hash_password(password)
-        
-        first_name = data.get('firstName', '')
-        last_name = data.get('lastName', '')
-        
-        if not data.get('name') and not first_name and not last_name:
-            return jsonify({
-                'success': False,
-                'error': 'Name is required (either name or firstName/lastName)'
-            }), 400
-        
-        # Handle name field (legacy) or new firstName/lastName fields
-        full_name = data.get('name')
-        if not full_name:
-            middle_name = data.get('middleName', '')
-            full_name = f"{first_name} {middle_name} {last_name}".strip()
+        email = vector_data['email']
         
         # PRIORITY 1: Store in ChromaDB first (fast, local)
         try:
-            vector_data = {
-                'email': email,
-                'username': data.get('username', ''),
-                'firstName': first_name,
-                'middleName': data.get('middleName', ''),
-                'lastName': last_name,
-                'name': full_name,
-                'age': int(data.get('age', 0)) if data.get('age') else 0,
-                'weight': float(data.get('weight', 0)) if data.get('weight') else 0,
-                'height': float(data.get('height', 0)) if data.get('height') else 0,
-                'gender': data.get('gender') or data.get('sex', ''),
-                'fitnessLevel': data.get('fitnessLevel', ''),
-                'agentType': data.get('agentType') or data.get('fitnessAgent', 'personal_trainer'),
-                'medicalConditions': data.get('medicalConditions', []) if isinstance(data.get('medicalConditions'), list) else [],
-                'password': hashed_password  # Store hashed password in ChromaDB
-            }
             vector_store.store_user_profile(vector_data)
             logging.info(f"✅ User profile stored in ChromaDB: {email}")
         except Exception as ve:
@@ -777,6 +773,102 @@ def create_user_profile():
             'error': str(e)
         }), 500
 
+# Upper bound per bulk request; every profile costs one bcrypt hash (~250ms) that blocks the
+# gevent worker, so one request stays around 2.5s of CPU
+MAX_BULK_USER_PROFILES = 10
+
+# Charged per profile (see _bulk_profile_cost), so bulk import can't out-hash single registration by much
+BULK_USER_PROFILE_RATE_LIMIT = "20 per minute"
+
+def _bulk_profile_cost():
+    """Rate-limit cost of a bulk request: one unit per submitted profile"""
+    users = (request.get_json(silent=True) or {}).get('users')
+    if isinstance(users, list) and users:
+        return min(len(users), MAX_BULK_USER_PROFILES)
+    return 1
+
+@app.route('/api/bulk-create-user-profiles', methods=['POST'])
+@limiter.limit(BULK_USER_PROFILE_RATE_LIMIT, cost=_bulk_profile_cost)
+@require_sync_token
+def bulk_create_user_profiles():
+    """
+    Create several new user profiles in one request and store them in ChromaDB with a single add
+    Sync-token only; emails that already have a profile are rejected, never overwritten
+    """
+    try:
+        data = request.json or {}
+        users = data.get('users')
+        
+        if not isinstance(users, list) or not users:
+            return jsonify({
+                'success': False,
+                'error': 'A non-empty users array is required'
+            }), 400
+        
+        if len(users) > MAX_BULK_USER_PROFILES:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BULK_USER_PROFILES} users per request'
+            }), 400
+        
+        # Look up existing accounts before hashing anything, so taken emails cost no bcrypt work
+        candidate_emails = set()
+        for user in users:
+            if isinstance(user, dict):
+                is_valid_email, email_or_error = Validator.validate_email_format(user.get('email'))
+                if is_valid_email:
+                    candidate_emails.add(email_or_error)
+        existing_emails = vector_store.existing_user_emails(candidate_emails)
+        
+        # Validate and hash each profile; invalid ones are reported without failing the batch
+        results = []
+        profiles = []
+        seen_emails = set()
+        for user in users:
+            if not isinstance(user, dict):
+                results.append({'email': None, 'success': False, 'error': 'Invalid user record'})
+                continue
+            is_valid_email, email_or_error = Validator.validate_email_format(user.get('email'))
+            if is_valid_email and email_or_error in existing_emails:
+                results.append({'email': email_or_error, 'success': False, 'error': 'User already exists'})
+                continue
+            vector_data, error = build_user_profile_data(user)
+            if not error and vector_data['email'] in seen_emails:
+                error = 'Duplicate email in request'
+            if error:
+                results.append({'email': user.get('email'), 'success': False, 'error': error})
+                continue
+            seen_emails.add(vector_data['email'])
+            results.append({'email': vector_data['email'], 'success': True})
+            profiles.append(vector_data)
+        
+        if profiles:
+            try:
+                vector_store.store_user_profiles(profiles)
+                logging.info(f"✅ Stored {len(profiles)} user profiles in ChromaDB")
+            except Exception as ve:
+                logging.error(f"Failed to store user profiles in ChromaDB: {str(ve)}")
+                return jsonify({
+                    'success': False,
+                    'error': 'Failed to store user profiles'
+                }), 500
+        
+        return jsonify({
+            'success': True,
+            'created': len(profiles),
+            'failed': len(results) - len(profiles),
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        logging.error(f"Error bulk creating user profiles: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/get-user-profile/<email>', methods=['GET'])
 @require_auth
 def get_user_profile(email):
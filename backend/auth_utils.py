@@ -4,6 +4,7 @@ Provides password hashing, JWT tokens, and auth decorators
 """
 
 import bcrypt
+import hmac
 import jwt
 import re
 from datetime import datetime, timedelta
@@ -20,6 +21,9 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-producti
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Shared secret for server-side sync endpoints (bulk profile import); they are disabled while unset
+SYNC_API_TOKEN = os.getenv('SYNC_API_TOKEN')
+
 class PasswordHasher:
     """Handles password hashing and verification using bcrypt"""
     
@@ -230,6 +234,33 @@ def optional_auth(f):
     
     return decorated_function
 
+def require_sync_token(f):
+    """
+    Decorator for sync-only endpoints (e.g. bulk profile import).
+    Requires an X-Sync-Token header matching SYNC_API_TOKEN; responds 503 when no token is configured.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        import logging
+        
+        if not SYNC_API_TOKEN:
+            return jsonify({
+                'success': False,
+                'error': 'Sync endpoints are disabled (SYNC_API_TOKEN is not set)'
+            }), 503
+        
+        token = request.headers.get('X-Sync-Token', '')
+        if not hmac.compare_digest(token.encode('utf-8'), SYNC_API_TOKEN.encode('utf-8')):
+            logging.warning(f"Invalid or missing sync token for {request.path}")
+            return jsonify({
+                'success': False,
+                'error': 'A valid X-Sync-Token header is required'
+            }), 401
+        
+        return f(*args, **kwargs)
+    
+    return decorated_function
+
 # Utility function to convert email to Azure Search ID
 def email_to_search_id(email: str) -> str:
     """Convert email to Azure Search compatible ID"""
@@ -0,0 +1,17 @@
+"""
+Cached Azure OpenAI client factory
+Clients are built once per configuration and reused, so repeated lookups share the SDK client
+"""
+from functools import lru_cache
+from openai import AsyncAzureOpenAI
+
+@lru_cache(maxsize=32)
+def get_async_openai_client(api_key, api_version, base_url=None, azure_endpoint=None, http_client=None):
+    """AsyncAzureOpenAI for one configuration; pass base_url (deployment path) or azure_endpoint, and optionally a shared httpx.AsyncClient"""
+    return AsyncAzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        base_url=base_url,
+        azure_endpoint=azure_endpoint,
+        http_client=http_client,
+    )
@@ -0,0 +1,37 @@
+"""
+Azure OpenAI / Vision settings, read from the environment once
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_API_VERSION = "2024-05-01-preview"
+DEFAULT_MODEL = "gpt-4o"
+
+@dataclass(slots=True, frozen=True)
+class AzureConfig:
+    """Snapshot of the Azure OpenAI environment variables"""
+    endpoint: Optional[str]
+    key: Optional[str]
+    api_version: str
+    model: str
+    project_endpoint: Optional[str]
+    vision_endpoint: Optional[str]
+    vision_key: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "AzureConfig":
+        return cls(
+            endpoint=os.getenv("AZURE_OPENAI_API_ENDPOINT"),
+            key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_API_VERSION),
+            model=os.getenv("AZURE_OPENAI_MODEL", DEFAULT_MODEL),
+            project_endpoint=os.getenv("PROJECT_ENDPOINT"),
+            vision_endpoint=os.getenv("AZURE_VISION_ENDPOINT"),
+            vision_key=os.getenv("AZURE_VISION_KEY"),
+        )
+
+CONFIG = AzureConfig.from_env()
@@ -61,6 +61,17 @@ def post_fork(server, worker):
     """Called just after a worker has been forked."""
     print(f"👷 Worker {worker.pid} spawned")
 
+def post_worker_init(worker):
+    """Called just after a worker has loaded the app, before it accepts requests."""
+    # The vector store is built lazily; pay for ChromaDB and the embedding model here instead
+    # of in the worker's first request
+    try:
+        from vector_store import warm_up
+        warm_up()
+        print(f"🔥 Worker {worker.pid} vector store warmed up")
+    except Exception as e:
+        print(f"⚠️  Worker {worker.pid} vector store warm-up failed: {e}")
+
 def pre_exec(server):
     """Called just before a new master process is forked."""
     print("🔄 Forking new master process...")
@@ -3,8 +3,14 @@
 List all user accounts stored in ChromaDB
 """
 
+import io
+import sys
+from collections import Counter
+
 from vector_store import FitnessVectorStore
-import json
+
+# Number of accounts fetched from ChromaDB per page
+PAGE_SIZE = 1000
 
 def list_all_accounts():
     """List all user accounts from ChromaDB"""
@@ -13,60 +19,74 @@ def list_all_accounts():
     # Initialize vector store
     vs = FitnessVectorStore()
     
-    # Get all users from the collection
+    # Page through the users collection so peak memory stays bounded
     print("\n📊 Fetching all user accounts...")
-    results = vs.users_collection.get()
+    account_count = vs.users_collection.count()
     
-    if not results['ids']:
+    if not account_count:
         print("❌ No user accounts found in ChromaDB")
-        return
+        return 0
     
-    print(f"\n✅ Found {len(results['ids'])} user accounts\n")
+    print(f"\n✅ Found {account_count} user accounts\n")
     print("=" * 80)
     
-    # Display each user
-    for i, (user_id, metadata) in enumerate(zip(results['ids'], results['metadatas']), 1):
-        print(f"\n👤 Account #{i}")
-        print(f"ID: {user_id}")
-        print(f"Email: {metadata.get('email', 'N/A')}")
-        print(f"Username: {metadata.get('username', 'N/A')}")
-        print(f"Name: {metadata.get('firstName', '')} {metadata.get('middleName', '')} {metadata.get('lastName', '')}".strip())
-        print(f"Age: {metadata.get('age', 'N/A')}")
-        print(f"Gender: {metadata.get('gender', 'N/A')}")
-        print(f"Weight: {metadata.get('weight', 'N/A')} lbs")
-        print(f"Height: {metadata.get('height', 'N/A')} inches")
-        print(f"Fitness Level: {metadata.get('fitnessLevel', 'N/A')}")
-        print(f"Coach Type: {metadata.get('agentType', 'N/A')}")
-        print(f"Medical Conditions: {metadata.get('medicalConditions', 'None')}")
-        print(f"Created: {metadata.get('created_at', 'N/A')}")
-        print(f"Has Password: {'Yes' if metadata.get('password') else 'No'}")
-        print("-" * 80)
+    total = 0
+    fitness_levels = Counter()
+    coach_types = Counter()
+    
+    offset = 0
+    while True:
+        results = vs.users_collection.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])
+        ids = results['ids']
+        if not ids:
+            break
+        
+        # Display each user and tally the summary stats in the same pass;
+        # the page is rendered into one buffer and written to stdout once
+        buf = io.StringIO()
+        for user_id, metadata in zip(ids, results['metadatas']):
+            total += 1
+            name = f"{metadata.get('firstName', '')} {metadata.get('middleName', '')} {metadata.get('lastName', '')}".strip()
+            buf.write(
+                f"\n👤 Account #{total}\n"
+                f"ID: {user_id}\n"
+                f"Email: {metadata.get('email', 'N/A')}\n"
+                f"Username: {metadata.get('username', 'N/A')}\n"
+                f"Name: {name}\n"
+                f"Age: {metadata.get('age', 'N/A')}\n"
+                f"Gender: {metadata.get('gender', 'N/A')}\n"
+                f"Weight: {metadata.get('weight', 'N/A')} lbs\n"
+                f"Height: {metadata.get('height', 'N/A')} inches\n"
+                f"Fitness Level: {metadata.get('fitnessLevel', 'N/A')}\n"
+                f"Coach Type: {metadata.get('agentType', 'N/A')}\n"
+                f"Medical Conditions: {metadata.get('medicalConditions', 'None')}\n"
+                f"Created: {metadata.get('created_at', 'N/A')}\n"
+                f"Has Password: {'Yes' if metadata.get('password') else 'No'}\n"
+                f"{'-' * 80}\n"
+            )
+            
+            fitness_levels[metadata.get('fitnessLevel', 'Unknown')] += 1
+            coach_types[metadata.get('agentType', 'Unknown')] += 1
+        
+        sys.stdout.write(buf.getvalue())
+        
+        if len(ids) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
     
     # Summary
     print(f"\n📈 Summary:")
-    print(f"Total Accounts: {len(results['ids'])}")
-    
-    # Count by fitness level
-    fitness_levels = {}
-    for metadata in results['metadatas']:
-        level = metadata.get('fitnessLevel', 'Unknown')
-        fitness_levels[level] = fitness_levels.get(level, 0) + 1
+    print(f"Total Accounts: {total}")
     
     print(f"\nBy Fitness Level:")
-    for level, count in sorted(fitness_levels.items()):
+    for level, count in fitness_levels.most_common():
         print(f"  - {level}: {count}")
     
-    # Count by coach type
-    coach_types = {}
-    for metadata in results['metadatas']:
-        coach = metadata.get('agentType', 'Unknown')
-        coach_types[coach] = coach_types.get(coach, 0) + 1
-    
     print(f"\nBy Coach Type:")
-    for coach, count in sorted(coach_types.items()):
+    for coach, count in coach_types.most_common():
         print(f"  - {coach}: {count}")
     
-    return results
+    return total
 
 if __name__ == "__main__":
     list_all_accounts()
@@ -5,7 +5,7 @@ Run this once to populate the exercise database
 """
 
 import os
-from vector_store import vector_store
+from vector_store import vector_store, EXERCISE_COLLECTION_METADATA
 
 def main():
     print("=" * 60)
@@ -20,10 +20,10 @@ def main():
         return False
     
     print(f"📂 Dataset found: {csv_path}")
-    print(f"📊 Current exercise count: {vector_store.exercise_collection.count()}")
+    current_count = vector_store.exercise_collection.count()
+    print(f"📊 Current exercise count: {current_count}")
     
     # Ask for confirmation if exercises already exist
-    current_count = vector_store.exercise_collection.count()
     if current_count > 0:
         response = input(f"\n⚠️  Warning: {current_count} exercises already exist. Reload? (yes/no): ")
         if response.lower() != 'yes':
@@ -37,7 +37,7 @@ def main():
             vector_store.exercise_collection = vector_store.client.get_or_create_collection(
                 name="exercise_database",
                 embedding_function=vector_store.embedding_fn,
-                metadata={"description": "Exercise database for RAG recommendations"}
+                metadata=EXERCISE_COLLECTION_METADATA
             )
             print("✅ Cleared existing exercises")
         except Exception as e:
@@ -4,9 +4,18 @@ Keeps only the functions actually used by the application
 """
 
 import os
+import re
 import json
+import hashlib
 import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from statistics import fmean
 from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 
@@ -15,6 +24,23 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+
+def _env_flag(name):
+    """Read a "true"/"false" environment flag (anything but "true" is False)"""
+    return os.getenv(name, "false").lower() == "true"
+
+
+# Feature flags, read once at import; call reload_env() after changing the environment
+_DISABLE_MCP = _env_flag("DISABLE_MCP")
+_ENABLE_AGENTIC_RAG = _env_flag("ENABLE_AGENTIC_RAG")
+
+
+def reload_env():
+    """Re-read the cached DISABLE_MCP / ENABLE_AGENTIC_RAG flags from the environment"""
+    global _DISABLE_MCP, _ENABLE_AGENTIC_RAG
+    _DISABLE_MCP = _env_flag("DISABLE_MCP")
+    _ENABLE_AGENTIC_RAG = _env_flag("ENABLE_AGENTIC_RAG")
+
 # Check if Azure Search is available
 AZURE_SEARCH_AVAILABLE = False
 try:
@@ -33,97 +59,206 @@ try:
 except ImportError:
     logger.warning("MCP not available")
 
+# Azure OpenAI client and the agentic RAG agent used by the fallback path
+try:
+    from openai import AzureOpenAI
+except ImportError:
+    AzureOpenAI = None
+    logger.warning("OpenAI SDK not available")
+
+try:
+    from agentic_rag import AgenticFitnessRAG
+except ImportError:
+    AgenticFitnessRAG = None
+    logger.warning("Agentic RAG not available")
+
+
+# Process-wide Azure Search client, shared so its HTTP connection pool stays warm
+_search_client = None
+_search_client_initialized = False
+_search_client_lock = threading.Lock()
+
+
+def _create_search_client():
+    """Initialize Azure Search client"""
+    if not AZURE_SEARCH_AVAILABLE:
+        return None
+        
+    try:
+        endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
+        key = os.getenv("AZURE_SEARCH_ADMIN_KEY") or os.getenv("AZURE_SEARCH_KEY")
+        index_name = os.getenv("AZURE_SEARCH_INDEX_NAME", "fitness-index")
+        
+        if endpoint and key:
+            search_client = SearchClient(
+                endpoint=endpoint,
+                index_name=index_name,
+                credential=AzureKeyCredential(key)
+            )
+            logger.info("Azure Search client initialized successfully")
+            return search_client
+        else:
+            logger.warning("Azure Search credentials not found")
+            return None
+    except Exception as e:
+        logger.error(f"Failed to initialize Azure Search client: {e}")
+        return None
+
+
+def get_search_client():
+    """Return the shared Azure Search client, creating it on first use"""
+    global _search_client, _search_client_initialized
+    
+    if not _search_client_initialized:
+        with _search_client_lock:
+            if not _search_client_initialized:
+                _search_client = _create_search_client()
+                _search_client_initialized = True
+    return _search_client
+
+
+# Worker pool for issuing independent Azure Search queries concurrently (I/O bound)
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="azure-search")
+
+# Threads the agentic RAG runs on; kept off the loop's default executor, which asyncio.run
+# waits for on exit and would hold sync callers until a timed-out agent finished anyway
+_AGENTIC_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agentic-rag")
+
+# Azure Search terms per coaching goal (unknown goals use "general")
+_AGENT_SEARCH_TERMS = {
+    'weight_loss': ('cardio', 'fat burning', 'HIIT', 'bodyweight'),
+    'muscle_gain': ('strength', 'muscle building', 'hypertrophy'),
+    'cardio': ('cardio', 'endurance', 'running', 'cycling'),
+    'strength': ('strength', 'powerlifting', 'heavy'),
+    'general': ('beginner', 'general fitness', 'bodyweight'),
+}
+
+# Extra keywords appended to exercise queries per goal
+_GOAL_QUERY_AUGMENTATION = {
+    'weight_loss': " fat burning cardio HIIT",
+    'muscle_gain': " strength muscle building hypertrophy",
+    'cardio': " cardio endurance running cycling",
+    'strength': " strength powerlifting heavy lifting",
+}
+
+# Index fields actually read from search hits. Projecting with select keeps large fields
+# such as contentVector off the wire; fields missing from the index schema (difficulty,
+# bodyPart, userAge, ...) are left out because select rejects unknown names, and the
+# parsers below fall back to their defaults for them exactly as before.
+_EXERCISE_SELECT_FIELDS = ["title", "target", "equipment", "instructions", "category", "type"]
+_BENCHMARK_SELECT_FIELDS = ["caloriesBurned", "sessionDuration"]
+
+# OData filter applied server-side so member records never reach the exercise parser
+_EXERCISE_FILTER = "type ne 'member_data'"
+
+# Member-record titles: "Member ..." or "<name> - ... Training" (title is not filterable server-side)
+_MEMBER_TITLE_RE = re.compile(r"Member |^(?=.*? - ).*?Training", re.S)
+
+# Exercise dict fields, in output order, and their defaults when a hit lacks them
+_EX_DEFAULTS = {
+    "title": "",
+    "target": "General",
+    "equipment": "Unknown",
+    "instructions": "",
+    "difficulty": "intermediate",
+    "category": "general",
+    "bodyPart": "",
+    "type": "exercise"
+}
+_EX_KEYS = tuple(_EX_DEFAULTS)
+_EX_DEFAULT_VALUES = tuple(_EX_DEFAULTS.values())
+
+# TTL/LRU cache for parsed Azure Search results; the queries come from a small fixed
+# vocabulary (goal x search term x age bucket x gender) so hit rates are high
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = 256
+# Bump AZURE_SEARCH_INDEX_VERSION after re-indexing to invalidate cached results
+_SEARCH_INDEX_VERSION = os.getenv("AZURE_SEARCH_INDEX_VERSION", "")
+_search_cache = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+# Rendered enhanced-fallback recommendations keyed by the parsed UserProfile; same TTL
+# as the search cache, since a recommendation embeds the search results it was built from
+RECOMMENDATION_CACHE_MAX_ENTRIES = 2048
+_recommendation_cache = OrderedDict()
+
+# Short-lived cache for the RAG/hybrid entry points, keyed by user_data plus image content
+RAG_CACHE_TTL_SECONDS = int(os.getenv("RAG_CACHE_TTL", "300"))
+RAG_CACHE_MAX_ENTRIES = 256
+_rag_cache = OrderedDict()
+
+
+def _search_cache_get(key, cache=_search_cache):
+    """Return a cached search result (or recommendation), or None if missing or expired"""
+    with _search_cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return value
+
+
+def _search_cache_put(key, value, cache=_search_cache, max_entries=SEARCH_CACHE_MAX_ENTRIES, ttl=None):
+    """Store a search result (or recommendation), evicting the least recently used entries"""
+    if ttl is None:
+        ttl = SEARCH_CACHE_TTL_SECONDS
+    with _search_cache_lock:
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
 
 class FitnessMCPClient:
     """Simplified MCP Client for Azure Search integration only"""
     
     def __init__(self):
         self.session = None
-        self.search_client = self._init_search_client()
-    
-    def _init_search_client(self):
-        """Initialize Azure Search client"""
-        if not AZURE_SEARCH_AVAILABLE:
-            return None
-            
-        try:
-            endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
-            key = os.getenv("AZURE_SEARCH_ADMIN_KEY") or os.getenv("AZURE_SEARCH_KEY")
-            index_name = os.getenv("AZURE_SEARCH_INDEX_NAME", "fitness-index")
-            
-            if endpoint and key:
-                search_client = SearchClient(
-                    endpoint=endpoint,
-                    index_name=index_name,
-                    credential=AzureKeyCredential(key)
-                )
-                logger.info("Azure Search client initialized successfully")
-                return search_client
-            else:
-                logger.warning("Azure Search credentials not found")
-                return None
-        except Exception as e:
-            logger.error(f"Failed to initialize Azure Search client: {e}")
-            return None
+        self.search_client = get_search_client()
 
 
 # MAIN FUNCTIONS USED BY APP.PY
 
 async def get_fitness_recommendation_mcp(images, gender, age, weight, height, agent_type, health_conditions=""):
     """Get MCP-enhanced fitness recommendation with fallback"""
+    user_data = {
+        'gender': gender,
+        'age': age,
+        'weight': weight,
+        'height': height,
+        'health_conditions': health_conditions,
+        'agent_type': agent_type
+    }
     
     # Check if MCP is disabled via environment variable
-    if os.getenv("DISABLE_MCP", "false").lower() == "true":
+    if _DISABLE_MCP:
         logger.info("MCP disabled via environment variable, using fallback")
-        user_data = {
-            'gender': gender,
-            'age': age,
-            'weight': weight,
-            'height': height,
-            'health_conditions': health_conditions,
-            'agent_type': agent_type
-        }
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await get_fallback_fitness_recommendation_async(user_data, images)
     
     try:
-        user_data = {
-            'gender': gender,
-            'age': age,
-            'weight': weight,
-            'height': height,
-            'health_conditions': health_conditions,
-            'agent_type': agent_type
-        }
-        
         # Since MCP is typically not available, go directly to fallback
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await get_fallback_fitness_recommendation_async(user_data, images)
         
     except Exception as e:
         logger.error(f"MCP recommendation failed: {e}")
-        user_data = {
-            'gender': gender,
-            'age': age,
-            'weight': weight,
-            'height': height,
-            'health_conditions': health_conditions,
-            'agent_type': agent_type
-        }
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await get_fallback_fitness_recommendation_async(user_data, images)
 
 
 def get_fallback_fitness_recommendation(user_data, images):
+    """Synchronous entry point for get_fallback_fitness_recommendation_async (for non-async callers)"""
+    return _run_sync(get_fallback_fitness_recommendation_async(user_data, images))
+
+
+async def get_fallback_fitness_recommendation_async(user_data, images):
     """Provide comprehensive fitness recommendation using Azure Search and Agentic RAG when MCP is not available"""
-    age = int(user_data.get('age', 30))
-    gender = user_data.get('gender', 'male')
-    weight = float(user_data.get('weight', 150))
-    height = user_data.get('height')  # Height in inches
-    agent_type = user_data.get('agent_type', 'general')
-    health_conditions = user_data.get('health_conditions', '')
-    
     # Check if Agentic RAG is enabled
-    enable_agentic = os.getenv("ENABLE_AGENTIC_RAG", "false").lower() == "true"
+    enable_agentic = _ENABLE_AGENTIC_RAG
     
-    logger.info(f"🔧 DEBUG: enable_agentic={enable_agentic}, ENABLE_AGENTIC_RAG env={os.getenv('ENABLE_AGENTIC_RAG')}")
+    logger.info("🔧 DEBUG: enable_agentic=%s", enable_agentic)
     
     if enable_agentic:
         logger.info("✅ Agentic RAG is ENABLED - attempting to use ChromaDB")
@@ -133,19 +268,20 @@ def get_fallback_fitness_recommendation(user_data, images):
             
             # Check if exercises are loaded
             exercise_count = vector_store.exercise_collection.count()
-            logger.info(f"📊 ChromaDB exercise count: {exercise_count}")
+            logger.info("📊 ChromaDB exercise count: %d", exercise_count)
             
             if exercise_count == 0:
                 error_msg = "❌ CRITICAL: No exercises in ChromaDB! Exercise database is empty."
                 logger.error(error_msg)
                 return f"ERROR: {error_msg} The agentic system requires exercise data to function."
             
-            logger.info(f"✅ ChromaDB ready with {exercise_count} exercises")
+            logger.info("✅ ChromaDB ready with %d exercises", exercise_count)
             
             # Initialize Azure OpenAI client for image analysis using VISION endpoint
             azure_openai_client = None
             try:
-                from openai import AzureOpenAI
+                if AzureOpenAI is None:
+                    raise ImportError("openai package is not installed")
                 # Try specific vision model deployment name first, fallback to regular model
                 model = os.getenv('AZURE_VISION_MODEL', os.getenv('AZURE_OPENAI_MODEL', 'gpt-4o'))
                 
@@ -163,9 +299,9 @@ def get_fallback_fitness_recommendation(user_data, images):
                     logger.error("❌ AZURE_OPENAI_API_ENDPOINT or AZURE_OPENAI_API_KEY not set")
                     raise ValueError("Azure OpenAI credentials not configured")
                 
-                logger.info(f"🔍 Azure OpenAI Endpoint: {azure_endpoint}")
-                logger.info(f"🔍 Model deployment: {model}")
-                logger.info(f"🔍 API version: {api_version}")
+                logger.info("🔍 Azure OpenAI Endpoint: %s", azure_endpoint)
+                logger.info("🔍 Model deployment: %s", model)
+                logger.info("🔍 API version: %s", api_version)
                 
                 clean_endpoint = azure_endpoint.rstrip('/')
                 
@@ -174,65 +310,49 @@ def get_fallback_fitness_recommendation(user_data, images):
                     api_version=api_version,
                     azure_endpoint=clean_endpoint,
                 )
-                logger.info(f"✅ Azure OpenAI client initialized for vision analysis")
-                logger.info(f"   Endpoint: {clean_endpoint}")
-                logger.info(f"   Model: {model}")
+                logger.info("✅ Azure OpenAI client initialized for vision analysis")
+                logger.info("   Endpoint: %s", clean_endpoint)
+                logger.info("   Model: %s", model)
             except Exception as e:
                 logger.error(f"❌ Azure OpenAI client initialization FAILED: {type(e).__name__}: {e}")
-                logger.error(f"🔍 Full error:", exc_info=True)
+                logger.error("🔍 Full error:", exc_info=True)
             
-            from agentic_rag import AgenticFitnessRAG
+            if AgenticFitnessRAG is None:
+                raise ImportError("agentic_rag module could not be imported")
             agentic_agent = AgenticFitnessRAG(vector_store, azure_openai_client)
             
-            # Generate agentic recommendation using thread-based execution
-            import threading
-            import queue
-            
-            def run_agentic_in_thread():
-                    result_queue = queue.Queue()
-                    def agentic_worker():
-                        try:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            result = loop.run_until_complete(
-                                agentic_agent.generate_recommendation(user_data, images)
-                            )
-                            result_queue.put(("success", result))
-                        except Exception as e:
-                            result_queue.put(("error", str(e)))
-                        finally:
-                            loop.close()
-                    
-                    thread = threading.Thread(target=agentic_worker)
-                    thread.start()
-                    thread.join(timeout=60)  # 60 second timeout
-                    
-                    if thread.is_alive():
-                        logger.error("Agentic RAG timeout")
-                        return None
-                    
-                    if not result_queue.empty():
-                        status, result = result_queue.get()
-                        if status == "success":
-                            return result
-                        else:
-                            logger.error(f"Agentic RAG error: {result}")
-                    return None
+            async def run_agentic_with_timeout():
+                # The agent makes blocking OpenAI calls, so it runs on its own loop in a
+                # worker thread; wait_for can then give up on it after 60s like the old join did
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.get_running_loop().run_in_executor(
+                            _AGENTIC_EXECUTOR, asyncio.run, agentic_agent.generate_recommendation(user_data, images)
+                        ),
+                        timeout=60  # 60 second timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.error("Agentic RAG timeout")
+                except Exception as e:
+                    logger.error(f"Agentic RAG error: {e}")
+                return None
             
             try:
-                logger.info("🚀 Starting agentic RAG thread execution...")
-                agentic_result = run_agentic_in_thread()
+                logger.info("🚀 Starting agentic RAG execution...")
+                agentic_result = await run_agentic_with_timeout()
                 
                 if agentic_result:
-                    logger.info(f"✅ Agentic RAG succeeded! Result length: {len(str(agentic_result))} chars")
-                    logger.info(f"📝 Result preview: {str(agentic_result)[:200]}...")
+                    if logger.isEnabledFor(logging.INFO):
+                        result_text = str(agentic_result)
+                        logger.info("✅ Agentic RAG succeeded! Result length: %d chars", len(result_text))
+                        logger.info("📝 Result preview: %s...", result_text[:200])
                     # Return the result directly - it should already be a string or dict
                     return agentic_result
                 else:
-                    error_msg = "❌ AGENTIC RAG RETURNED NONE - Check thread timeout (60s) or async errors in logs"
+                    error_msg = "❌ AGENTIC RAG RETURNED NONE - Check timeout (60s) or async errors in logs"
                     logger.error(error_msg)
                     # Return dict for app.py to extract error
-                    return {"recommendation": f"ERROR: {error_msg}\n\nThis usually means:\n1. Thread timeout (>60 seconds)\n2. Async event loop error\n3. Exception in agentic_agent.generate_recommendation()\n\nCheck container logs for detailed stack trace."}
+                    return {"recommendation": f"ERROR: {error_msg}\n\nThis usually means:\n1. Timeout (>60 seconds)\n2. Async event loop error\n3. Exception in agentic_agent.generate_recommendation()\n\nCheck container logs for detailed stack trace."}
                     
             except Exception as e:
                 error_msg = f"❌ Agentic RAG execution failed with exception: {e}"
@@ -267,31 +387,34 @@ def get_fallback_fitness_recommendation(user_data, images):
 
 
 def get_azure_search_enhanced_fallback_sync(user_data, images, mcp_client):
-    """Enhanced fallback using Azure Search RAG capabilities - synchronous version"""
-    age = int(user_data.get('age', 30))
-    gender = user_data.get('gender', 'male')
-    weight = float(user_data.get('weight', 150))
-    height = user_data.get('height', None)
-    agent_type = user_data.get('agent_type', 'general')
-    health_conditions = user_data.get('health_conditions', '')
+    """
+    Enhanced fallback using Azure Search RAG capabilities - synchronous version
+    user_data may be a raw user_data dict or an already parsed UserProfile
+    """
+    profile = UserProfile.from_user_data(user_data)
+    agent_type = profile.agent_type
+    
+    # The rendered plan depends only on the profile and the index contents; the image
+    # status line is the one per-request part, so it is patched in after the lookup
+    cache_key = ("recommendation", _SEARCH_INDEX_VERSION, profile)
+    cached = _search_cache_get(cache_key, _recommendation_cache)
+    if cached is not None:
+        return _with_image_status(cached, images)
     
     # Build user profile for search
     user_profile = {
-        "age": age,
-        "gender": gender,
-        "weight": weight,
+        "age": profile.age,
+        "gender": profile.gender,
+        "weight": profile.weight_lb,
         "goal": agent_type,
         "fitness_level": "beginner",  # Default
         "available_equipment": ["bodyweight", "dumbbells"],
         "exercise_type": agent_type
     }
     
-    # Add height to profile if provided and not empty
-    if height and str(height).strip():
-        try:
-            user_profile["height"] = float(height)
-        except (ValueError, TypeError):
-            pass  # Skip if height conversion fails
+    # Add height to profile if provided and valid
+    if profile.height_in is not None:
+        user_profile["height"] = profile.height_in
     
     # Search for relevant exercises using Azure Search (sync version)
     relevant_exercises = []
@@ -299,101 +422,117 @@ def get_azure_search_enhanced_fallback_sync(user_data, images, mcp_client):
     
     try:
         # Search based on user goals
-        if agent_type == 'weight_loss':
-            search_terms = ['cardio', 'fat burning', 'HIIT', 'bodyweight']
-        elif agent_type == 'muscle_gain':
-            search_terms = ['strength', 'muscle building', 'hypertrophy']
-        elif agent_type == 'cardio':
-            search_terms = ['cardio', 'endurance', 'running', 'cycling']
-        elif agent_type == 'strength':
-            search_terms = ['strength', 'powerlifting', 'heavy']
-        else:
-            search_terms = ['beginner', 'general fitness', 'bodyweight']
+        search_terms = _AGENT_SEARCH_TERMS.get(agent_type, _AGENT_SEARCH_TERMS['general'])
         
-        # Search for exercises (sync version)
-        for term in search_terms[:2]:  # Limit searches
-            exercises = search_exercises_sync(mcp_client.search_client, term, user_profile)
-            relevant_exercises.extend(exercises[:3])  # Top 3 per search
-        
-        # Search for performance benchmarks (sync version)
-        performance_benchmarks = search_performance_benchmarks_sync(
-            mcp_client.search_client, agent_type, user_profile
+        # One OR-ed exercise query for the top goal terms, issued concurrently with the
+        # benchmark search so the wall time is the slower round trip, not the sum
+        search_client = mcp_client.search_client
+        exercise_future = _SEARCH_EXECUTOR.submit(
+            iter_exercises_sync, search_client, search_terms[:2], user_profile  # Limit terms
+        )
+        benchmark_future = _SEARCH_EXECUTOR.submit(
+            search_performance_benchmarks_sync, search_client, agent_type, user_profile
         )
         
+        # Keep the top 6 distinct exercises (previously top 3 per term)
+        seen_titles = set()
+        for exercise in exercise_future.result():
+            title = exercise["title"]
+            if title in seen_titles:
+                continue
+            seen_titles.add(title)
+            relevant_exercises.append(exercise)
+            if len(relevant_exercises) == 6:
+                break
+        performance_benchmarks = benchmark_future.result()
+        
     except Exception as e:
         logger.error(f"Azure Search queries failed: {e}")
     
-    # Generate recommendation based on agent type
+    # Generate recommendation based on agent type (rendered without images, see above)
     if agent_type == 'weight_loss':
-        return generate_weight_loss_recommendation(age, gender, weight, height, health_conditions, relevant_exercises, performance_benchmarks, images)
+        result = generate_weight_loss_recommendation(profile, relevant_exercises, performance_benchmarks, None)
     elif agent_type == 'muscle_gain':
-        return generate_muscle_gain_recommendation(age, gender, weight, height, relevant_exercises, images)
+        result = generate_muscle_gain_recommendation(profile, relevant_exercises, None)
     else:
-        return generate_general_fitness_recommendation(age, weight, height, relevant_exercises, images)
+        result = generate_general_fitness_recommendation(profile, relevant_exercises, None)
+    
+    # Don't keep a degraded plan around when the searches failed or came back empty
+    if relevant_exercises:
+        _search_cache_put(cache_key, result, _recommendation_cache, RECOMMENDATION_CACHE_MAX_ENTRIES)
+    return _with_image_status(result, images)
+
+
+def _with_image_status(result, images):
+    """Copy of a recommendation rendered without images, with its vision status line set for images"""
+    if not images:
+        return dict(result)
+    recommendation = result["recommendation"].replace(_NO_IMAGES_STATUS, _image_status(images), 1)
+    return {**result, "recommendation": recommendation}
+
+
+def _iter_exercises(results):
+    """Lazily parse Azure Search hits into exercise dicts, skipping member-record titles"""
+    for result in results:
+        # Skip titles that follow the member-record naming pattern
+        if _MEMBER_TITLE_RE.search(result.get("title", "")):
+            continue
+        
+        yield dict(zip(_EX_KEYS, map(result.get, _EX_KEYS, _EX_DEFAULT_VALUES)))
 
 
-def search_exercises_sync(search_client, search_term, user_profile):
-    """Synchronous version of exercise search"""
+def iter_exercises_sync(search_client, search_term, user_profile):
+    """
+    Iterate over the exercises matching search_term without copying the cached result
+    search_term may be a single term or a sequence of terms; several terms are
+    combined into one Lucene OR query so they cost a single round trip
+    """
     if not search_client:
-        return []
+        return iter(())
+    
+    if isinstance(search_term, str):
+        terms_key = search_term.lower()
+        query = search_term
+        query_type = "simple"
+    else:
+        terms_key = tuple(term.lower() for term in search_term)
+        query = " OR ".join(f"({term})" for term in search_term)
+        query_type = "full"
+    
+    cache_key = ("exercises", _SEARCH_INDEX_VERSION, terms_key, user_profile.get('goal'))
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return iter(cached)
     
     try:
-        # Build search query based on user profile and search term
-        query = f"{search_term}"
-        
         # Add user-specific filters
-        if user_profile.get('goal'):
-            goal = user_profile['goal']
-            if goal == 'weight_loss':
-                query += " fat burning cardio HIIT"
-            elif goal == 'muscle_gain':
-                query += " strength muscle building hypertrophy"
-            elif goal == 'cardio':
-                query += " cardio endurance running cycling"
-            elif goal == 'strength':
-                query += " strength powerlifting heavy lifting"
+        query += _GOAL_QUERY_AUGMENTATION.get(user_profile.get('goal'), "")
         
-        # Search parameters (no need to filter member data since index only contains exercises)
+        # Search parameters; member data rows are excluded by the index itself
         search_params = {
             "search_text": query,
             "top": 10,
             "search_mode": "any",
-            "query_type": "simple"
+            "query_type": query_type,
+            "select": _EXERCISE_SELECT_FIELDS,
+            "filter": _EXERCISE_FILTER
         }
         
-        # Execute search
-        results = search_client.search(**search_params)
-        
-        exercises = []
-        for result in results:
-            # Additional filter to ensure we only get actual exercises
-            result_type = result.get("type", "")
-            title = result.get("title", "")
-            
-            # Skip if this is member data or has member-like title pattern
-            if (result_type == "member_data" or 
-                "Member " in title or 
-                " - " in title and "Training" in title):
-                continue
-                
-            exercise = {
-                "title": title,
-                "target": result.get("target", "General"),
-                "equipment": result.get("equipment", "Unknown"),
-                "instructions": result.get("instructions", ""),
-                "difficulty": result.get("difficulty", "intermediate"),
-                "category": result.get("category", "general"),
-                "bodyPart": result.get("bodyPart", ""),
-                "type": result.get("type", "exercise")
-            }
-            exercises.append(exercise)
+        # Execute search; the parsed page is kept whole since it is shared through the cache
+        exercises = tuple(_iter_exercises(search_client.search(**search_params)))
         
-        logger.info(f"Found {len(exercises)} exercises for '{search_term}' and profile {user_profile.get('goal', 'general')}")
-        return exercises
+        logger.info("Found %d exercises for '%s' and profile %s", len(exercises), search_term, user_profile.get('goal', 'general'))
+        _search_cache_put(cache_key, exercises)
+        return iter(exercises)
         
     except Exception as e:
         logger.error(f"Error searching exercises: {e}")
-        return []
+        return iter(())
+
+
+def search_exercises_sync(search_client, search_term, user_profile):
+    """Synchronous version of exercise search; list form of iter_exercises_sync"""
+    return list(iter_exercises_sync(search_client, search_term, user_profile))
 
 
 def search_performance_benchmarks_sync(search_client, goal_type, user_profile):
@@ -413,27 +552,41 @@ def search_performance_benchmarks_sync(search_client, goal_type, user_profile):
         age_range = "young" if age < 30 else "middle" if age < 50 else "mature"
         query += f" {age_range} {gender}"
         
-        search_params = {
-            "search_text": query,
-            "top": 5,
-            "search_mode": "any"
-        }
-        
-        results = search_client.search(**search_params)
+        # Cached rows leave userAge/userGender as None so each caller's own values fill the gaps
+        cache_key = ("benchmarks", _SEARCH_INDEX_VERSION, goal_type, age_range, str(gender).lower())
+        rows = _search_cache_get(cache_key)
+        if rows is None:
+            search_params = {
+                "search_text": query,
+                "top": 5,
+                "search_mode": "any",
+                "select": _BENCHMARK_SELECT_FIELDS
+            }
+            
+            results = search_client.search(**search_params)
+            
+            rows = []
+            for result in results:
+                rows.append({
+                    "caloriesBurned": result.get("caloriesBurned", 300),
+                    "sessionDuration": result.get("sessionDuration", 45),
+                    "difficulty": result.get("difficulty", "intermediate"),
+                    "userAge": result.get("userAge"),
+                    "userGender": result.get("userGender"),
+                    "goalType": result.get("goalType", goal_type)
+                })
+            _search_cache_put(cache_key, rows)
         
         benchmarks = []
-        for result in results:
-            benchmark = {
-                "caloriesBurned": result.get("caloriesBurned", 300),
-                "sessionDuration": result.get("sessionDuration", 45),
-                "difficulty": result.get("difficulty", "intermediate"),
-                "userAge": result.get("userAge", age),
-                "userGender": result.get("userGender", gender),
-                "goalType": result.get("goalType", goal_type)
-            }
+        for row in rows:
+            benchmark = dict(row)
+            if benchmark["userAge"] is None:
+                benchmark["userAge"] = age
+            if benchmark["userGender"] is None:
+                benchmark["userGender"] = gender
             benchmarks.append(benchmark)
         
-        logger.info(f"Found {len(benchmarks)} performance benchmarks for {goal_type}")
+        logger.info("Found %d performance benchmarks for %s", len(benchmarks), goal_type)
         return benchmarks
         
     except Exception as e:
@@ -441,55 +594,104 @@ def search_performance_benchmarks_sync(search_client, goal_type, user_profile):
         return []
 
 
-def generate_weight_loss_recommendation(age, gender, weight, height, health_conditions, exercises, benchmarks, images):
-    """Generate weight loss recommendation with vision status"""
-    # Use provided height or default values if height is not provided
-    height_cm = 170  # Default height in cm
-    height_display = None
-    
+DEFAULT_HEIGHT_CM = 170
+
+
+# Parsed (height_cm, height_inches) for the plain whole-inch strings the profile forms send
+_HEIGHT_BY_DIGITS = {str(inches): (inches * 2.54, float(inches)) for inches in range(1, 121)}
+
+
+def _parse_height(height):
+    """Parse a height in inches; returns (height_cm, height_inches or None when missing/invalid)"""
+    if isinstance(height, (int, float)):
+        return (height * 2.54, float(height)) if height else (DEFAULT_HEIGHT_CM, None)
+    parsed = _HEIGHT_BY_DIGITS.get(height) if isinstance(height, str) else None
+    if parsed is not None:
+        return parsed
     if height and str(height).strip():  # Check for non-empty value
         try:
             height_inches = float(height)
-            height_cm = height_inches * 2.54  # Convert inches to cm
-            height_display = height_inches
+            return height_inches * 2.54, height_inches  # Convert inches to cm
         except (ValueError, TypeError):
-            height_cm = 170  # Fallback default
-            height_display = None
-    
-    # Calculate BMR and daily calories using actual height
-    if gender.lower() == 'male':
-        bmr = 88.362 + (13.397 * weight * 0.453592) + (4.799 * height_cm) - (5.677 * age)
-    else:
-        bmr = 447.593 + (9.247 * weight * 0.453592) + (3.098 * height_cm) - (4.330 * age)
-    
-    daily_calories = int(bmr * 1.55)
-    target_calories = daily_calories - 500
-    protein_grams = int(target_calories * 0.30 / 4)
-    carb_grams = int(target_calories * 0.40 / 4)
-    fat_grams = int(target_calories * 0.30 / 9)
+            pass
+    return DEFAULT_HEIGHT_CM, None
+
+
+@dataclass(slots=True, frozen=True)
+class UserProfile:
+    """User profile parsed once from user_data and passed down to the recommendation generators"""
+    age: int
+    gender: str
+    weight_lb: float
+    height_in: Optional[float]
+    agent_type: str
+    health_conditions: str
     
-    # Build exercise recommendations from search results
-    exercise_suggestions = ""
-    if exercises:
-        exercise_suggestions = "\n**🎯 RECOMMENDED EXERCISES (from fitness database):**\n"
-        for i, exercise in enumerate(exercises[:5], 1):
-            title = exercise.get('title', 'Unknown Exercise')
-            target = exercise.get('target', 'General')
-            equipment = exercise.get('equipment', 'Unknown')
-            exercise_suggestions += f"- **{title}** (Targets: {target}, Equipment: {equipment})\n"
+    @classmethod
+    def from_user_data(cls, user_data):
+        """Build a profile from a user_data dict (an existing UserProfile is returned as is)"""
+        if isinstance(user_data, cls):
+            return user_data
+        _, height_in = _parse_height(user_data.get('height'))
+        return cls(
+            age=int(user_data.get('age', 30)),
+            gender=user_data.get('gender', 'male'),
+            weight_lb=float(user_data.get('weight', 150)),
+            height_in=height_in,
+            agent_type=user_data.get('agent_type', 'general'),
+            health_conditions=user_data.get('health_conditions', '')
+        )
     
-    benchmark_info = ""
-    if benchmarks:
-        avg_calories = sum(b.get('caloriesBurned', 0) for b in benchmarks) / len(benchmarks)
-        avg_duration = sum(b.get('sessionDuration', 0) for b in benchmarks) / len(benchmarks)
-        benchmark_info = f"\n**📊 PERFORMANCE BENCHMARKS (from similar users):**\n- Average calories burned per session: {int(avg_calories)}\n- Average workout duration: {int(avg_duration)} minutes\n"
+    @property
+    def height_cm(self):
+        """Height in cm, or the default when no valid height was given"""
+        return self.height_in * 2.54 if self.height_in is not None else DEFAULT_HEIGHT_CM
     
-    # Add image analysis status at the top
-    image_status = "❌ NO IMAGES ANALYZED"
-    if images and len(images) > 0:
-        image_status = f"📸 {len(images)} IMAGE(S) PROVIDED FOR ANALYSIS"
+    @property
+    def height_text(self):
+        """Height as shown in the plans ("70.0 inches" or "Not specified")"""
+        return f"{self.height_in} inches" if self.height_in else "Not specified"
+
+
+@lru_cache(maxsize=1024)
+def _bmr(gender, weight, height_cm, age):
+    """Harris-Benedict BMR from weight in lbs, height in cm and age in years"""
+    if gender.lower() == 'male':
+        return 88.362 + (13.397 * weight * 0.453592) + (4.799 * height_cm) - (5.677 * age)
+    return 447.593 + (9.247 * weight * 0.453592) + (3.098 * height_cm) - (4.330 * age)
+
+
+# Vision status line of a recommendation rendered without images
+_NO_IMAGES_STATUS = "❌ NO IMAGES ANALYZED"
+
+
+def _image_status(images):
+    """Vision status line for the images attached to a request"""
+    if images:
+        return f"📸 {len(images)} IMAGE(S) PROVIDED FOR ANALYSIS"
+    return _NO_IMAGES_STATUS
+
+# Section headers for the database exercise list in the recommendations
+_EXERCISES_HEADER = "\n**🎯 RECOMMENDED EXERCISES (from fitness database):**\n"
+_EXERCISES_HEADER_STRENGTH = "\n**💪 RECOMMENDED EXERCISES (from fitness database):**\n"
+
+
+def _format_exercise_suggestions(exercises, header):
+    """Render exercises as a markdown bullet list under header ("" when there are none)"""
+    if not exercises:
+        return ""
     
-    recommendation = f"""## 📸 VISION ANALYSIS STATUS: {image_status}
+    parts = [header]
+    for exercise in exercises:
+        title = exercise.get('title', 'Unknown Exercise')
+        target = exercise.get('target', 'General')
+        equipment = exercise.get('equipment', 'Unknown')
+        parts.append(f"- **{title}** (Targets: {target}, Equipment: {equipment})\n")
+    return "".join(parts)
+
+
+# Weight loss plan markdown up to the last placeholder; rendered with str.format_map
+_WEIGHT_LOSS_TEMPLATE = """## 📸 VISION ANALYSIS STATUS: {image_status}
 *(Note: Advanced vision analysis requires Agentic RAG mode)*
 
 **🔥 Enhanced Weight Loss Recommendation**
@@ -498,22 +700,22 @@ def generate_weight_loss_recommendation(age, gender, weight, height, health_cond
 **📊 YOUR PROFILE ANALYSIS:**
 - Age: {age} years
 - Gender: {gender}
-- Weight: {weight} lbs ({weight * 0.453592:.1f} kg)
-- Height: {str(height_display) + " inches" if height_display else "Not specified"} ({height_cm:.1f} cm)
-- Health conditions: {health_conditions or 'None specified'}
+- Weight: {weight} lbs ({weight_kg:.1f} kg)
+- Height: {height_text} ({height_cm:.1f} cm)
+- Health conditions: {health_conditions_text}
 - Goal: Weight Loss & Fat Burning
 
 **🔥 METABOLIC CALCULATIONS:**
-- Basal Metabolic Rate (BMR): {int(bmr)} calories/day
+- Basal Metabolic Rate (BMR): {bmr} calories/day
 - Total Daily Energy Expenditure: {daily_calories} calories/day
 - Target Daily Calories: {target_calories} calories/day
-- Daily Caloric Deficit: {daily_calories - target_calories} calories
+- Daily Caloric Deficit: {calorie_deficit} calories
 
 **🍽️ NUTRITION PLAN:**
 - Protein: {protein_grams}g daily (30% of calories)
 - Carbohydrates: {carb_grams}g daily (40% of calories)
 - Fat: {fat_grams}g daily (30% of calories)
-- Water intake: {int(weight * 0.453592 * 35)}ml per day
+- Water intake: {water_ml}ml per day
 
 {exercise_suggestions}
 
@@ -523,7 +725,7 @@ def generate_weight_loss_recommendation(age, gender, weight, height, health_cond
 - Warm-up: 5 minutes light movement
 - HIIT Circuit: 20 minutes (30 sec work / 30 sec rest)
 - Cool-down: 5 minutes stretching
-- Target heart rate: {int((220 - age) * 0.75)}-{int((220 - age) * 0.85)} bpm
+- Target heart rate: {hr_zone_75}-{hr_zone_85} bpm
 
 **Tuesday - Strength Circuit:**
 - Full body resistance training: 30-40 minutes
@@ -533,7 +735,7 @@ def generate_weight_loss_recommendation(age, gender, weight, height, health_cond
 **Wednesday - Active Recovery:**
 - 30-45 minutes moderate cardio
 - Walking, light cycling, or swimming
-- Target heart rate: {int((220 - age) * 0.60)}-{int((220 - age) * 0.70)} bpm
+- Target heart rate: {hr_zone_60}-{hr_zone_70} bpm
 
 **Thursday - Strength Training:**
 - Upper/Lower body split: 35-45 minutes
@@ -564,13 +766,72 @@ def generate_weight_loss_recommendation(age, gender, weight, height, health_cond
 - Week 4: Reassess and adjust plan based on progress
 
 **⚠️ SAFETY & RECOVERY:**
-{f"- Health considerations: {health_conditions}" if health_conditions else "- Listen to your body and rest when needed"}
-- Stay hydrated: Drink water before, during, and after workouts
+{safety_note}
+"""
+
+# Static remainder of the weight loss plan, appended as is
+_WEIGHT_LOSS_SUFFIX = """- Stay hydrated: Drink water before, during, and after workouts
 - Sleep: Aim for 7-9 hours per night for optimal recovery
 - Nutrition timing: Eat within 30 minutes post-workout
 
 *This enhanced recommendation combines ChromaDB vector database insights with advanced metabolic calculations for optimal results.*
 """
+
+
+def generate_weight_loss_recommendation(profile, exercises, benchmarks, images):
+    """Generate weight loss recommendation with vision status"""
+    age, gender, weight = profile.age, profile.gender, profile.weight_lb
+    height_cm, height_text = profile.height_cm, profile.height_text
+    health_conditions = profile.health_conditions
+    
+    # Calculate BMR and daily calories using actual height
+    bmr = _bmr(gender, weight, height_cm, age)
+    
+    daily_calories = int(bmr * 1.55)
+    target_calories = daily_calories - 500
+    protein_grams = int(target_calories * 0.30 / 4)
+    carb_grams = int(target_calories * 0.40 / 4)
+    fat_grams = int(target_calories * 0.30 / 9)
+    
+    # Build exercise recommendations from search results
+    exercise_suggestions = _format_exercise_suggestions(exercises[:5], _EXERCISES_HEADER)
+    
+    benchmark_info = ""
+    if benchmarks:
+        # Rows from search_performance_benchmarks_sync always carry both keys
+        avg_calories = fmean(b['caloriesBurned'] for b in benchmarks)
+        avg_duration = fmean(b['sessionDuration'] for b in benchmarks)
+        benchmark_info = f"\n**📊 PERFORMANCE BENCHMARKS (from similar users):**\n- Average calories burned per session: {int(avg_calories)}\n- Average workout duration: {int(avg_duration)} minutes\n"
+    
+    # Add image analysis status at the top
+    image_status = _image_status(images)
+    
+    heart_rate_max = 220 - age
+    recommendation = _WEIGHT_LOSS_TEMPLATE.format_map({
+        'image_status': image_status,
+        'age': age,
+        'gender': gender,
+        'weight': weight,
+        'weight_kg': weight * 0.453592,
+        'height_text': height_text,
+        'height_cm': height_cm,
+        'health_conditions_text': health_conditions or 'None specified',
+        'bmr': int(bmr),
+        'daily_calories': daily_calories,
+        'target_calories': target_calories,
+        'calorie_deficit': daily_calories - target_calories,
+        'protein_grams': protein_grams,
+        'carb_grams': carb_grams,
+        'fat_grams': fat_grams,
+        'water_ml': int(weight * 0.453592 * 35),
+        'exercise_suggestions': exercise_suggestions,
+        'hr_zone_60': int(heart_rate_max * 0.60),
+        'hr_zone_70': int(heart_rate_max * 0.70),
+        'hr_zone_75': int(heart_rate_max * 0.75),
+        'hr_zone_85': int(heart_rate_max * 0.85),
+        'benchmark_info': benchmark_info,
+        'safety_note': f"- Health considerations: {health_conditions}" if health_conditions else "- Listen to your body and rest when needed",
+    }) + _WEIGHT_LOSS_SUFFIX
     
     return {
         "recommendation": recommendation,
@@ -594,47 +855,8 @@ def generate_weight_loss_recommendation(age, gender, weight, height, health_cond
     }
 
 
-def generate_muscle_gain_recommendation(age, gender, weight, height, exercises, images):
-    """Generate muscle gain recommendation with vision status"""
-    # Use provided height or default values if height is not provided
-    height_cm = 170  # Default height in cm
-    height_display = None
-    
-    if height and str(height).strip():  # Check for non-empty value
-        try:
-            height_inches = float(height)
-            height_cm = height_inches * 2.54  # Convert inches to cm
-            height_display = height_inches
-        except (ValueError, TypeError):
-            height_cm = 170  # Fallback default
-            height_display = None
-    
-    # Muscle building calculations using actual height
-    if gender.lower() == 'male':
-        bmr = 88.362 + (13.397 * weight * 0.453592) + (4.799 * height_cm) - (5.677 * age)
-    else:
-        bmr = 447.593 + (9.247 * weight * 0.453592) + (3.098 * height_cm) - (4.330 * age)
-    
-    daily_calories = int(bmr * 1.725)  # Activity factor for muscle building
-    surplus_calories = daily_calories + 300
-    protein_grams = int(weight * 0.453592 * 2.2)  # 2.2g per kg for muscle gain
-    
-    # Build exercise recommendations from search results
-    exercise_suggestions = ""
-    if exercises:
-        exercise_suggestions = "\n**💪 RECOMMENDED EXERCISES (from fitness database):**\n"
-        for i, exercise in enumerate(exercises[:6], 1):
-            title = exercise.get('title', 'Unknown Exercise')
-            target = exercise.get('target', 'General')
-            equipment = exercise.get('equipment', 'Unknown')
-            exercise_suggestions += f"- **{title}** (Targets: {target}, Equipment: {equipment})\n"
-    
-    # Add image analysis status
-    image_status = "❌ NO IMAGES ANALYZED"
-    if images and len(images) > 0:
-        image_status = f"📸 {len(images)} IMAGE(S) PROVIDED FOR ANALYSIS"
-    
-    recommendation = f"""## 📸 VISION ANALYSIS STATUS: {image_status}
+# Muscle gain plan markdown up to the last placeholder; rendered with str.format_map
+_MUSCLE_GAIN_TEMPLATE = """## 📸 VISION ANALYSIS STATUS: {image_status}
 *(Note: Advanced vision analysis requires Agentic RAG mode)*
 
 **💪 Enhanced Muscle Building Recommendation**
@@ -643,8 +865,8 @@ def generate_muscle_gain_recommendation(age, gender, weight, height, exercises,
 **📊 YOUR MUSCLE BUILDING PROFILE:**
 - Age: {age} years
 - Gender: {gender}
-- Weight: {weight} lbs ({weight * 0.453592:.1f} kg)
-- Height: {str(height_display) + " inches" if height_display else "Not specified"} ({height_cm:.1f} cm)
+- Weight: {weight} lbs ({weight_kg:.1f} kg)
+- Height: {height_text} ({height_cm:.1f} cm)
 - Goal: Muscle Growth & Strength Development
 
 **🔥 MUSCLE BUILDING CALCULATIONS:**
@@ -655,12 +877,15 @@ def generate_muscle_gain_recommendation(age, gender, weight, height, exercises,
 
 **🍽️ MUSCLE BUILDING NUTRITION:**
 - Protein: {protein_grams}g (35% - muscle protein synthesis)
-- Carbohydrates: {int(surplus_calories * 0.45 / 4)}g (45% - workout fuel)
-- Fat: {int(surplus_calories * 0.20 / 9)}g (20% - hormone production)
+- Carbohydrates: {carb_grams}g (45% - workout fuel)
+- Fat: {fat_grams}g (20% - hormone production)
 - Meal timing: Protein every 3-4 hours
 
 {exercise_suggestions}
+"""
 
+# Static remainder of the muscle gain plan (workout split, progression), appended as is
+_MUSCLE_GAIN_SUFFIX = """
 **🏋️ MUSCLE BUILDING WORKOUT SPLIT:**
 
 **Day 1 - Chest & Triceps (Push):**
@@ -707,6 +932,40 @@ def generate_muscle_gain_recommendation(age, gender, weight, height, exercises,
 
 *This recommendation leverages exercise database insights and evidence-based muscle building protocols.*
 """
+
+
+def generate_muscle_gain_recommendation(profile, exercises, images):
+    """Generate muscle gain recommendation with vision status"""
+    age, gender, weight = profile.age, profile.gender, profile.weight_lb
+    height_cm, height_text = profile.height_cm, profile.height_text
+    
+    # Muscle building calculations using actual height
+    bmr = _bmr(gender, weight, height_cm, age)
+    
+    daily_calories = int(bmr * 1.725)  # Activity factor for muscle building
+    surplus_calories = daily_calories + 300
+    protein_grams = int(weight * 0.453592 * 2.2)  # 2.2g per kg for muscle gain
+    
+    # Build exercise recommendations from search results
+    exercise_suggestions = _format_exercise_suggestions(exercises[:6], _EXERCISES_HEADER_STRENGTH)
+    
+    # Add image analysis status
+    image_status = _image_status(images)
+    
+    recommendation = _MUSCLE_GAIN_TEMPLATE.format_map({
+        'image_status': image_status,
+        'age': age,
+        'gender': gender,
+        'weight': weight,
+        'weight_kg': weight * 0.453592,
+        'height_text': height_text,
+        'height_cm': height_cm,
+        'surplus_calories': surplus_calories,
+        'protein_grams': protein_grams,
+        'carb_grams': int(surplus_calories * 0.45 / 4),
+        'fat_grams': int(surplus_calories * 0.20 / 9),
+        'exercise_suggestions': exercise_suggestions,
+    }) + _MUSCLE_GAIN_SUFFIX
     
     return {
         "recommendation": recommendation,
@@ -716,36 +975,8 @@ def generate_muscle_gain_recommendation(age, gender, weight, height, exercises,
     }
 
 
-def generate_general_fitness_recommendation(age, weight, height, exercises, images):
-    """Generate general fitness recommendation with vision status"""
-    # Use provided height or default values if height is not provided
-    height_cm = 170  # Default height in cm
-    height_display = None
-    
-    if height and str(height).strip():  # Check for non-empty value
-        try:
-            height_inches = float(height)
-            height_cm = height_inches * 2.54  # Convert inches to cm
-            height_display = height_inches
-        except (ValueError, TypeError):
-            height_cm = 170  # Fallback default
-            height_display = None
-    
-    # Add image analysis status
-    image_status = "❌ NO IMAGES ANALYZED"
-    if images and len(images) > 0:
-        image_status = f"📸 {len(images)} IMAGE(S) PROVIDED FOR ANALYSIS"
-    
-    exercise_suggestions = ""
-    if exercises:
-        exercise_suggestions = "\n**🎯 RECOMMENDED EXERCISES (from fitness database):**\n"
-        for i, exercise in enumerate(exercises[:4], 1):
-            title = exercise.get('title', 'Unknown Exercise')
-            target = exercise.get('target', 'General')
-            equipment = exercise.get('equipment', 'Unknown')
-            exercise_suggestions += f"- **{title}** (Targets: {target}, Equipment: {equipment})\n"
-    
-    recommendation = f"""## 📸 VISION ANALYSIS STATUS: {image_status}
+# General fitness plan markdown up to the last placeholder; rendered with str.format_map
+_GENERAL_FITNESS_TEMPLATE = """## 📸 VISION ANALYSIS STATUS: {image_status}
 *(Note: Advanced vision analysis requires Agentic RAG mode)*
 
 **🌟 Enhanced General Fitness Program**
@@ -754,7 +985,7 @@ def generate_general_fitness_recommendation(age, weight, height, exercises, imag
 **👤 YOUR FITNESS PROFILE:**
 - Age: {age} years
 - Weight: {weight} lbs
-- Height: {str(height_display) + " inches" if height_display else "Not specified"} ({height_cm:.1f} cm)
+- Height: {height_text} ({height_cm:.1f} cm)
 - Goal: Complete fitness and health optimization
 - Approach: Balanced training for all fitness components
 
@@ -774,8 +1005,11 @@ def generate_general_fitness_recommendation(age, weight, height, exercises, imag
 
 **Tuesday - Cardiovascular Endurance:**
 - Moderate intensity: 30-40 minutes
-- Heart rate zone: {int((220 - age) * 0.65)}-{int((220 - age) * 0.75)} bpm
-- Variety: Walking, cycling, swimming
+- Heart rate zone: {hr_zone_65}-{hr_zone_75} bpm
+"""
+
+# Static remainder of the general fitness plan (weekly structure, goals), appended as is
+_GENERAL_FITNESS_SUFFIX = """- Variety: Walking, cycling, swimming
 - Enjoyable activities encouraged
 
 **Wednesday - Functional Movement:**
@@ -817,6 +1051,29 @@ def generate_general_fitness_recommendation(age, weight, height, exercises, imag
 
 *This program combines database-driven exercise selection with comprehensive fitness principles for optimal health outcomes.*
 """
+
+
+def generate_general_fitness_recommendation(profile, exercises, images):
+    """Generate general fitness recommendation with vision status"""
+    age, weight = profile.age, profile.weight_lb
+    height_cm, height_text = profile.height_cm, profile.height_text
+    
+    # Add image analysis status
+    image_status = _image_status(images)
+    
+    exercise_suggestions = _format_exercise_suggestions(exercises[:4], _EXERCISES_HEADER)
+    
+    heart_rate_max = 220 - age
+    recommendation = _GENERAL_FITNESS_TEMPLATE.format_map({
+        'image_status': image_status,
+        'age': age,
+        'weight': weight,
+        'height_text': height_text,
+        'height_cm': height_cm,
+        'exercise_suggestions': exercise_suggestions,
+        'hr_zone_65': int(heart_rate_max * 0.65),
+        'hr_zone_75': int(heart_rate_max * 0.75),
+    }) + _GENERAL_FITNESS_SUFFIX
     
     return {
         "recommendation": recommendation,
@@ -826,42 +1083,16 @@ def generate_general_fitness_recommendation(age, weight, height, exercises, imag
     }
 
 
-def get_basic_fallback_recommendation(user_data, images):
-    """Basic fallback when both MCP and Azure Search fail"""
-    age = int(user_data.get('age', 30))
-    gender = user_data.get('gender', 'male')
-    weight = float(user_data.get('weight', 150))
-    height = user_data.get('height', None)
-    agent_type = user_data.get('agent_type', 'general')
-    
-    # Process height for display
-    height_display = None
-    height_cm = 170  # Default height in cm
-    
-    if height and str(height).strip():  # Check for non-empty value
-        try:
-            height_inches = float(height)
-            height_cm = height_inches * 2.54  # Convert inches to cm
-            height_display = height_inches
-        except (ValueError, TypeError):
-            height_cm = 170  # Fallback default
-            height_display = None
-    
-    # Add image analysis status
-    image_status = "❌ NO IMAGES ANALYZED"
-    if images and len(images) > 0:
-        image_status = f"📸 {len(images)} IMAGE(S) PROVIDED FOR ANALYSIS"
-    
-    return {
-        "recommendation": f"""## 📸 VISION ANALYSIS STATUS: {image_status}
+# Basic fallback plan markdown; rendered with str.format_map
+_BASIC_FALLBACK_TEMPLATE = """## 📸 VISION ANALYSIS STATUS: {image_status}
 *(Note: Advanced vision analysis requires Agentic RAG mode)*
 
 **Basic Fitness Recommendation**
 *Simplified approach when advanced features are unavailable*
 
 **Your Profile:** {gender}, age {age}, weight {weight} lbs
-- Height: {str(height_display) + " inches" if height_display else "Not specified"} ({height_cm:.1f} cm)
-**Goal:** {agent_type.replace('_', ' ').title()}
+- Height: {height_text} ({height_cm:.1f} cm)
+**Goal:** {goal}
 
 **Weekly Exercise Plan:**
 - 3-4 exercise sessions per week
@@ -876,7 +1107,29 @@ def get_basic_fallback_recommendation(user_data, images):
 - Consult healthcare providers for specific conditions
 
 **Note:** This is a simplified recommendation. For enhanced personalized guidance with exercise database insights and advanced calculations, ensure your system components are properly configured.
-        """,
+"""
+
+
+def get_basic_fallback_recommendation(user_data, images):
+    """Basic fallback when both MCP and Azure Search fail"""
+    profile = UserProfile.from_user_data(user_data)
+    age, gender, weight = profile.age, profile.gender, profile.weight_lb
+    height_cm, height_text = profile.height_cm, profile.height_text
+    agent_type = profile.agent_type
+    
+    # Add image analysis status
+    image_status = _image_status(images)
+    
+    return {
+        "recommendation": _BASIC_FALLBACK_TEMPLATE.format_map({
+            'image_status': image_status,
+            'gender': gender,
+            'age': age,
+            'weight': weight,
+            'height_text': height_text,
+            'height_cm': height_cm,
+            'goal': agent_type.replace('_', ' ').title(),
+        }),
         "fallback_mode": True,
         "enhanced_with": ["basic_guidelines"]
     }
@@ -884,37 +1137,114 @@ def get_basic_fallback_recommendation(user_data, images):
 
 # OTHER REQUIRED FUNCTIONS FOR COMPATIBILITY
 
+def _rag_cache_key(images, user_data):
+    """Cache key for a recommendation request: a digest of user_data and every image's content
+    Saved uploads get fresh uuid file names, so paths are hashed by their file bytes, not their name"""
+    digest = hashlib.sha1(json.dumps(user_data, sort_keys=True, default=str).encode())
+    for image in images or ():
+        digest.update(b"|")
+        if isinstance(image, bytes):
+            digest.update(image)
+        elif isinstance(image, (str, os.PathLike)) and os.path.isfile(image):
+            with open(image, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+        else:
+            digest.update(str(image).encode())
+    return ("rag", digest.hexdigest())
+
+
+def _is_error_result(result):
+    """True for the "ERROR: ..." results the fallback returns instead of raising"""
+    if isinstance(result, dict):
+        result = result.get("recommendation")
+    return isinstance(result, str) and result.startswith("ERROR:")
+
+
+async def _get_cached_fallback_recommendation(images, user_data):
+    """get_fallback_fitness_recommendation_async behind the short-lived RAG cache (errors are not cached)"""
+    cache_key = _rag_cache_key(images, user_data)
+    cached = _search_cache_get(cache_key, _rag_cache)
+    if cached is not None:
+        return dict(cached) if isinstance(cached, dict) else cached
+    
+    result = await get_fallback_fitness_recommendation_async(user_data, images)
+    if result is not None and not _is_error_result(result):
+        _search_cache_put(cache_key, result, _rag_cache, RAG_CACHE_MAX_ENTRIES, RAG_CACHE_TTL_SECONDS)
+    return result
+
+
 async def get_fitness_recommendation_with_rag(images, user_data):
     """Get RAG-enhanced fitness recommendation with fallback"""
     try:
         # This is now handled by the fallback system
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await _get_cached_fallback_recommendation(images, user_data)
     except Exception as e:
         logger.error(f"RAG recommendation failed: {e}")
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await get_fallback_fitness_recommendation_async(user_data, images)
 
 
 async def get_fitness_recommendation_hybrid(images, user_data):
     """Hybrid recommendation approach - delegates to fallback"""
     try:
         # Use the main fallback system which includes Agentic RAG
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await _get_cached_fallback_recommendation(images, user_data)
     except Exception as e:
         logger.error(f"Hybrid recommendation failed: {e}")
-        return get_fallback_fitness_recommendation(user_data, images)
+        return await get_fallback_fitness_recommendation_async(user_data, images)
+
+
+# Persistent event loop for the sync wrappers, so each call doesn't create and tear down
+# a loop; started on first use rather than at import so forked workers each get their own
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop():
+    """Return the shared background event loop, starting its daemon thread if needed"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mcp-client-loop", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def _submit(coro):
+    """Run a coroutine on the background loop and block until it finishes"""
+    loop = _get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking here would wait on the very loop that has to run the coroutine
+        coro.close()
+        raise RuntimeError("sync MCP client wrappers cannot be called from the background loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _run_sync(coro):
+    """asyncio.run(coro), or the background loop when called from inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    return _submit(coro)
 
 
 # Sync wrappers for backward compatibility
 def get_fitness_recommendation_sync(images, gender, age, weight, agent_type):
     """Synchronous wrapper for basic MCP fitness recommendation"""
-    return asyncio.run(get_fitness_recommendation_mcp(images, gender, age, weight, agent_type))
+    return _submit(get_fitness_recommendation_mcp(images, gender, age, weight, None, agent_type))
 
 
 def get_fitness_recommendation_with_rag_sync(images, user_data):
     """Synchronous wrapper for RAG-enhanced fitness recommendation"""
-    return asyncio.run(get_fitness_recommendation_with_rag(images, user_data))
+    return _submit(get_fitness_recommendation_with_rag(images, user_data))
 
 
 def get_fitness_recommendation_hybrid_sync(images, user_data):
     """Synchronous wrapper for hybrid fitness recommendation"""
-    return asyncio.run(get_fitness_recommendation_hybrid(images, user_data))
+    return _submit(get_fitness_recommendation_hybrid(images, user_data))
@@ -1,5 +1,8 @@
 import asyncio
 import json
+import sys
+from dataclasses import asdict, dataclass, is_dataclass
+from functools import lru_cache
 from typing import Any, Sequence
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
@@ -15,10 +18,36 @@ import mcp.types as types
 from pydantic import AnyUrl
 import logging
 
+# Optional faster JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# jsonschema ships with the MCP SDK versions that validate tool input
+try:
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("fitness-mcp-server")
 
+def _dumps(obj) -> str:
+    """Serialize obj (JSON data or a response dataclass) as 2-space indented JSON, via orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass  # e.g. non-string keys; let the stdlib encoder handle it
+    if is_dataclass(obj):
+        obj = asdict(obj)
+    return json.dumps(obj, indent=2)
+
 # Create the MCP server instance
 server = Server("fitness-advisor")
 
@@ -124,9 +153,27 @@ FOOD_DATABASE = {
     }
 }
 
-@server.list_resources()
-async def handle_list_resources() -> list[Resource]:
-    """List available fitness resources"""
+def _intern_strings(data):
+    """Intern the short strings in nested dicts/lists in place (keys and values)"""
+    if isinstance(data, dict):
+        for key in list(data):
+            value = data.pop(key)
+            if isinstance(key, str) and 1 < len(key) < 64:
+                key = sys.intern(key)
+            data[key] = _intern_strings(value)
+    elif isinstance(data, list):
+        data[:] = [_intern_strings(item) for item in data]
+    elif isinstance(data, str) and 1 < len(data) < 64:
+        return sys.intern(data)
+    return data
+
+# Repeated values ("beginner", "none", muscle names, ...) become shared objects, so the
+# filtering comparisons usually short-circuit on identity
+for _data in (FITNESS_EXERCISES, NUTRITION_PLANS, FOOD_DATABASE):
+    _intern_strings(_data)
+
+def _build_resource_list() -> list[Resource]:
+    """Build the Resource entries for the static exercise, nutrition and food data"""
     resources = []
     
     # Add exercise resources
@@ -158,184 +205,267 @@ async def handle_list_resources() -> list[Resource]:
     
     return resources
 
+# The data above is static, so the resource listing is built once at import
+_RESOURCE_LIST = _build_resource_list()
+
+# Serialized resource bodies for handle_read_resource, also computed once
+_EXERCISE_JSON = {k: _dumps(v) for k, v in FITNESS_EXERCISES.items()}
+_NUTRITION_JSON = {k: _dumps(v) for k, v in NUTRITION_PLANS.items()}
+_FOOD_JSON = {k: _dumps(v) for k, v in FOOD_DATABASE.items()}
+
+# Muscle group -> ids of the exercises that train it, and each exercise's catalog position
+_MUSCLE_INDEX: dict[str, set[str]] = {}
+for _exercise_id, _exercise_data in FITNESS_EXERCISES.items():
+    for _muscle in _exercise_data["muscle_groups"]:
+        _MUSCLE_INDEX.setdefault(_muscle, set()).add(_exercise_id)
+_EXERCISE_POSITION = {exercise_id: i for i, exercise_id in enumerate(FITNESS_EXERCISES)}
+
+# Lower-cased food names, plus an exact-match index over food ids and lower-cased names
+_FOOD_NAME_LOWER = {food_id: food_data["name"].lower() for food_id, food_data in FOOD_DATABASE.items()}
+_FOOD_EXACT = {food_id: food_id for food_id in FOOD_DATABASE}
+_FOOD_EXACT.update({name_lower: food_id for food_id, name_lower in _FOOD_NAME_LOWER.items()})
+
+# URI category segment -> serialized resources in that category
+_RESOURCE_MAP = {
+    "exercises": _EXERCISE_JSON,
+    "nutrition": _NUTRITION_JSON,
+    "foods": _FOOD_JSON
+}
+
+@server.list_resources()
+async def handle_list_resources() -> list[Resource]:
+    """List available fitness resources"""
+    return _RESOURCE_LIST
+
 @server.read_resource()
 async def handle_read_resource(uri: AnyUrl) -> str:
     """Read a specific fitness resource"""
     uri_str = str(uri)
     
-    if uri_str.startswith("fitness://exercises/"):
-        exercise_id = uri_str.split("/")[-1]
-        if exercise_id in FITNESS_EXERCISES:
-            return json.dumps(FITNESS_EXERCISES[exercise_id], indent=2)
-    
-    elif uri_str.startswith("fitness://nutrition/"):
-        plan_id = uri_str.split("/")[-1]
-        if plan_id in NUTRITION_PLANS:
-            return json.dumps(NUTRITION_PLANS[plan_id], indent=2)
-    
-    elif uri_str.startswith("fitness://foods/"):
-        food_id = uri_str.split("/")[-1]
-        if food_id in FOOD_DATABASE:
-            return json.dumps(FOOD_DATABASE[food_id], indent=2)
+    # fitness://<category>/<item_id>
+    parts = uri_str.rsplit("/", 2)
+    if len(parts) == 3 and parts[0] == "fitness:/":
+        table = _RESOURCE_MAP.get(parts[1])
+        if table is not None and parts[2] in table:
+            return table[parts[2]]
     
     raise ValueError(f"Resource not found: {uri}")
 
-@server.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """List available fitness tools"""
-    return [
-        Tool(
-            name="create_workout_plan",
-            description="Create a personalized workout plan based on user goals and preferences",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "goal": {
-                        "type": "string",
-                        "enum": ["weight_loss", "muscle_gain", "endurance", "flexibility"],
-                        "description": "Primary fitness goal"
-                    },
-                    "fitness_level": {
-                        "type": "string",
-                        "enum": ["beginner", "intermediate", "advanced"],
-                        "description": "Current fitness level"
-                    },
-                    "available_equipment": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of available equipment"
-                    },
-                    "days_per_week": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "maximum": 7,
-                        "description": "Number of workout days per week"
-                    }
+# Tool metadata is static, so the Tool objects and their schemas are built once at import
+_TOOL_LIST = [
+    Tool(
+        name="create_workout_plan",
+        description="Create a personalized workout plan based on user goals and preferences",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "goal": {
+                    "type": "string",
+                    "enum": ["weight_loss", "muscle_gain", "endurance", "flexibility"],
+                    "description": "Primary fitness goal"
                 },
-                "required": ["goal", "fitness_level", "days_per_week"]
-            }
-        ),
-        Tool(
-            name="calculate_nutrition_needs",
-            description="Calculate daily nutrition needs based on user profile",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "age": {"type": "integer", "minimum": 10, "maximum": 100},
-                    "gender": {"type": "string", "enum": ["male", "female"]},
-                    "weight": {"type": "number", "minimum": 30},
-                    "height": {"type": "number", "minimum": 100},
-                    "activity_level": {
-                        "type": "string", 
-                        "enum": ["sedentary", "light", "moderate", "active", "very_active"]
-                    },
-                    "goal": {"type": "string", "enum": ["weight_loss", "maintenance", "muscle_gain"]}
+                "fitness_level": {
+                    "type": "string",
+                    "enum": ["beginner", "intermediate", "advanced"],
+                    "description": "Current fitness level"
                 },
-                "required": ["age", "gender", "weight", "height", "activity_level", "goal"]
-            }
-        ),
-        Tool(
-            name="get_exercise_recommendations",
-            description="Get exercise recommendations based on muscle groups and equipment",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "target_muscles": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Target muscle groups"
-                    },
-                    "equipment": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Available equipment"
-                    },
-                    "difficulty": {
-                        "type": "string",
-                        "enum": ["beginner", "intermediate", "advanced"],
-                        "description": "Exercise difficulty level"
-                    }
+                "available_equipment": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of available equipment"
                 },
-                "required": ["target_muscles"]
-            }
-        ),
-        Tool(
-            name="identify_food_nutrition",
-            description="Identify nutritional information for a specific food item",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "food_name": {
-                        "type": "string",
-                        "description": "Name of the food item to analyze"
-                    },
-                    "portion_size": {
-                        "type": "string",
-                        "description": "Portion size (e.g., '1 cup', '100g', 'medium')",
-                        "default": "standard serving"
-                    },
-                    "fitness_goal": {
-                        "type": "string",
-                        "enum": ["weight_loss", "muscle_gain", "maintenance"],
-                        "description": "User's fitness goal for context"
-                    }
+                "days_per_week": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 7,
+                    "description": "Number of workout days per week"
+                }
+            },
+            "required": ["goal", "fitness_level", "days_per_week"]
+        }
+    ),
+    Tool(
+        name="calculate_nutrition_needs",
+        description="Calculate daily nutrition needs based on user profile",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "age": {"type": "integer", "minimum": 10, "maximum": 100},
+                "gender": {"type": "string", "enum": ["male", "female"]},
+                "weight": {"type": "number", "minimum": 30},
+                "height": {"type": "number", "minimum": 100},
+                "activity_level": {
+                    "type": "string", 
+                    "enum": ["sedentary", "light", "moderate", "active", "very_active"]
                 },
-                "required": ["food_name"]
-            }
-        ),
-        Tool(
-            name="generate_meal_plan",
-            description="Generate a complete meal plan based on nutrition goals",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "daily_calories": {
-                        "type": "integer",
-                        "minimum": 1200,
-                        "maximum": 4000,
-                        "description": "Target daily calories"
-                    },
-                    "fitness_goal": {
-                        "type": "string",
-                        "enum": ["weight_loss", "muscle_gain", "maintenance"],
-                        "description": "Primary fitness goal"
-                    },
-                    "dietary_restrictions": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Dietary restrictions or preferences"
-                    },
-                    "meals_per_day": {
-                        "type": "integer",
-                        "minimum": 3,
-                        "maximum": 6,
-                        "description": "Number of meals per day",
-                        "default": 5
-                    }
+                "goal": {"type": "string", "enum": ["weight_loss", "maintenance", "muscle_gain"]}
+            },
+            "required": ["age", "gender", "weight", "height", "activity_level", "goal"]
+        }
+    ),
+    Tool(
+        name="get_exercise_recommendations",
+        description="Get exercise recommendations based on muscle groups and equipment",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "target_muscles": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Target muscle groups"
                 },
-                "required": ["daily_calories", "fitness_goal"]
-            }
-        )
-    ]
+                "equipment": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Available equipment"
+                },
+                "difficulty": {
+                    "type": "string",
+                    "enum": ["beginner", "intermediate", "advanced"],
+                    "description": "Exercise difficulty level"
+                }
+            },
+            "required": ["target_muscles"]
+        }
+    ),
+    Tool(
+        name="identify_food_nutrition",
+        description="Identify nutritional information for a specific food item",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "food_name": {
+                    "type": "string",
+                    "description": "Name of the food item to analyze"
+                },
+                "portion_size": {
+                    "type": "string",
+                    "description": "Portion size (e.g., '1 cup', '100g', 'medium')",
+                    "default": "standard serving"
+                },
+                "fitness_goal": {
+                    "type": "string",
+                    "enum": ["weight_loss", "muscle_gain", "maintenance"],
+                    "description": "User's fitness goal for context"
+                }
+            },
+            "required": ["food_name"]
+        }
+    ),
+    Tool(
+        name="generate_meal_plan",
+        description="Generate a complete meal plan based on nutrition goals",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "daily_calories": {
+                    "type": "integer",
+                    "minimum": 1200,
+                    "maximum": 4000,
+                    "description": "Target daily calories"
+                },
+                "fitness_goal": {
+                    "type": "string",
+                    "enum": ["weight_loss", "muscle_gain", "maintenance"],
+                    "description": "Primary fitness goal"
+                },
+                "dietary_restrictions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Dietary restrictions or preferences"
+                },
+                "meals_per_day": {
+                    "type": "integer",
+                    "minimum": 3,
+                    "maximum": 6,
+                    "description": "Number of meals per day",
+                    "default": 5
+                }
+            },
+            "required": ["daily_calories", "fitness_goal"]
+        }
+    ),
+    Tool(
+        name="batch_tool_calls",
+        description="Run several of the other tools concurrently and return their results in order",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string", "description": "Tool name"},
+                            "arguments": {"type": "object", "description": "Tool arguments"}
+                        },
+                        "required": ["name"]
+                    },
+                    "minItems": 1,
+                    "description": "Tool calls to run"
+                }
+            },
+            "required": ["calls"]
+        }
+    )
+]
 
-@server.call_tool()
+# Input validators compiled once per tool; the SDK would otherwise re-check each schema
+# on every call via jsonschema.validate
+_TOOL_VALIDATORS = {}
+if JSONSCHEMA_AVAILABLE:
+    for _tool in _TOOL_LIST:
+        _validator_cls = validator_for(_tool.inputSchema)
+        _validator_cls.check_schema(_tool.inputSchema)
+        _TOOL_VALIDATORS[_tool.name] = _validator_cls(_tool.inputSchema)
+
+try:
+    _call_tool_decorator = server.call_tool(validate_input=False)
+except TypeError:  # older SDKs take no arguments and never validated input
+    _call_tool_decorator = server.call_tool()
+
+@server.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """List available fitness tools"""
+    return _TOOL_LIST
+
+@_call_tool_decorator
 async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[types.TextContent]:
     """Handle tool calls"""
-    if not arguments:
-        arguments = {}
-    
-    if name == "create_workout_plan":
-        return await create_workout_plan(arguments)
-    elif name == "calculate_nutrition_needs":
-        return await calculate_nutrition_needs(arguments)
-    elif name == "get_exercise_recommendations":
-        return await get_exercise_recommendations(arguments)
-    elif name == "identify_food_nutrition":
-        return await identify_food_nutrition(arguments)
-    elif name == "generate_meal_plan":
-        return await generate_meal_plan(arguments)
-    else:
+    return await _run_tool(name, arguments)
+
+async def _run_tool(name: str, arguments: dict[str, Any] | None) -> list[TextContent]:
+    """Validate arguments and dispatch a single tool call"""
+    handler = _TOOL_DISPATCH.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    arguments = arguments or {}
+    
+    validator = _TOOL_VALIDATORS.get(name)
+    if validator is not None:
+        error = best_match(validator.iter_errors(arguments))
+        if error is not None:
+            raise ValueError(f"Input validation error: {error.message}")
+    
+    return await handler(arguments)
+
+# Tool responses; fields are serialized in declaration order
+@dataclass(slots=True, frozen=True)
+class WorkoutPlan:
+    goal: str
+    fitness_level: str
+    schedule: str
+    exercises: list
+    recommendations: str
+
+@dataclass(slots=True, frozen=True)
+class NutritionResult:
+    bmr: int
+    tdee: int
+    daily_calories: int
+    goal: str
+    macros: dict
+    water_intake: str
 
 async def create_workout_plan(args: dict[str, Any]) -> list[TextContent]:
     """Create a personalized workout plan"""
@@ -344,14 +474,6 @@ async def create_workout_plan(args: dict[str, Any]) -> list[TextContent]:
     days_per_week = args.get("days_per_week", 3)
     equipment = args.get("available_equipment", [])
     
-    # Simple workout plan generation logic
-    plan = {
-        "goal": goal,
-        "fitness_level": fitness_level,
-        "schedule": f"{days_per_week} days per week",
-        "exercises": []
-    }
-    
     # Add exercises based on goal and equipment
     suitable_exercises = []
     for exercise_id, exercise_data in FITNESS_EXERCISES.items():
@@ -359,39 +481,39 @@ async def create_workout_plan(args: dict[str, Any]) -> list[TextContent]:
             if not equipment or exercise_data["equipment"] in equipment or exercise_data["equipment"] == "none":
                 suitable_exercises.append(exercise_data)
     
-    plan["exercises"] = suitable_exercises[:6]  # Limit to 6 exercises
-    plan["recommendations"] = f"Focus on {goal.replace('_', ' ')} with {fitness_level} level exercises"
+    # Simple workout plan generation logic
+    plan = WorkoutPlan(
+        goal=goal,
+        fitness_level=fitness_level,
+        schedule=f"{days_per_week} days per week",
+        exercises=suitable_exercises[:6],  # Limit to 6 exercises
+        recommendations=f"Focus on {goal.replace('_', ' ')} with {fitness_level} level exercises"
+    )
     
     return [TextContent(
         type="text",
-        text=json.dumps(plan, indent=2)
+        text=_dumps(plan)
     )]
 
-async def calculate_nutrition_needs(args: dict[str, Any]) -> list[TextContent]:
-    """Calculate daily nutrition needs"""
-    age = args.get("age")
-    gender = args.get("gender")
-    weight = args.get("weight")  # in kg
-    height = args.get("height")  # in cm
-    activity_level = args.get("activity_level")
-    goal = args.get("goal")
-    
+# Activity multipliers for TDEE
+_ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9
+}
+
+@lru_cache(maxsize=4096)
+def _compute_nutrition(age, gender, weight, height, activity_level, goal) -> tuple[float, float, float]:
+    """Returns: (bmr, tdee, daily_calories) for weight in kg and height in cm"""
     # Basic BMR calculation (Harris-Benedict)
     if gender == "male":
         bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
     else:
         bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
     
-    # Activity multipliers
-    activity_multipliers = {
-        "sedentary": 1.2,
-        "light": 1.375,
-        "moderate": 1.55,
-        "active": 1.725,
-        "very_active": 1.9
-    }
-    
-    tdee = bmr * activity_multipliers.get(activity_level, 1.55)
+    tdee = bmr * _ACTIVITY_MULTIPLIERS.get(activity_level, 1.55)
     
     # Adjust for goal
     if goal == "weight_loss":
@@ -401,22 +523,35 @@ async def calculate_nutrition_needs(args: dict[str, Any]) -> list[TextContent]:
     else:
         daily_calories = tdee  # maintenance
     
-    nutrition_plan = {
-        "bmr": round(bmr),
-        "tdee": round(tdee),
-        "daily_calories": round(daily_calories),
-        "goal": goal,
-        "macros": {
+    return bmr, tdee, daily_calories
+
+async def calculate_nutrition_needs(args: dict[str, Any]) -> list[TextContent]:
+    """Calculate daily nutrition needs"""
+    age = args.get("age")
+    gender = args.get("gender")
+    weight = args.get("weight")  # in kg
+    height = args.get("height")  # in cm
+    activity_level = args.get("activity_level")
+    goal = args.get("goal")
+    
+    bmr, tdee, daily_calories = _compute_nutrition(age, gender, weight, height, activity_level, goal)
+    
+    nutrition_plan = NutritionResult(
+        bmr=round(bmr),
+        tdee=round(tdee),
+        daily_calories=round(daily_calories),
+        goal=goal,
+        macros={
             "protein": f"{round(daily_calories * 0.3 / 4)}g (30%)",
             "carbohydrates": f"{round(daily_calories * 0.4 / 4)}g (40%)",
             "fat": f"{round(daily_calories * 0.3 / 9)}g (30%)"
         },
-        "water_intake": f"{round(weight * 35)}ml per day"
-    }
+        water_intake=f"{round(weight * 35)}ml per day"
+    )
     
     return [TextContent(
         type="text",
-        text=json.dumps(nutrition_plan, indent=2)
+        text=_dumps(nutrition_plan)
     )]
 
 async def get_exercise_recommendations(args: dict[str, Any]) -> list[TextContent]:
@@ -425,15 +560,17 @@ async def get_exercise_recommendations(args: dict[str, Any]) -> list[TextContent
     equipment = args.get("equipment", [])
     difficulty = args.get("difficulty", "beginner")
     
+    # Exercises targeting any of the requested muscles, in catalog order
+    candidate_ids = set().union(*(_MUSCLE_INDEX.get(muscle, ()) for muscle in target_muscles))
+    
     recommendations = []
-    for exercise_id, exercise_data in FITNESS_EXERCISES.items():
-        # Check if exercise targets any of the requested muscles
-        if any(muscle in exercise_data["muscle_groups"] for muscle in target_muscles):
-            # Check equipment requirements
-            if not equipment or exercise_data["equipment"] in equipment or exercise_data["equipment"] == "none":
-                # Check difficulty
-                if exercise_data["difficulty"] == difficulty or difficulty == "intermediate":
-                    recommendations.append(exercise_data)
+    for exercise_id in sorted(candidate_ids, key=_EXERCISE_POSITION.__getitem__):
+        exercise_data = FITNESS_EXERCISES[exercise_id]
+        # Check equipment requirements
+        if not equipment or exercise_data["equipment"] in equipment or exercise_data["equipment"] == "none":
+            # Check difficulty
+            if exercise_data["difficulty"] == difficulty or difficulty == "intermediate":
+                recommendations.append(exercise_data)
     
     result = {
         "target_muscles": target_muscles,
@@ -443,7 +580,7 @@ async def get_exercise_recommendations(args: dict[str, Any]) -> list[TextContent
     
     return [TextContent(
         type="text",
-        text=json.dumps(result, indent=2)
+        text=_dumps(result)
     )]
 
 async def identify_food_nutrition(args: dict[str, Any]) -> list[TextContent]:
@@ -452,12 +589,16 @@ async def identify_food_nutrition(args: dict[str, Any]) -> list[TextContent]:
     portion_size = args.get("portion_size", "standard serving")
     fitness_goal = args.get("fitness_goal", "maintenance")
     
-    # Check if food is in our database
+    # Check if food is in our database: exact id/name first, then substring matches
     food_info = None
-    for food_id, food_data in FOOD_DATABASE.items():
-        if food_id in food_name or food_name in food_data["name"].lower():
-            food_info = food_data.copy()
-            break
+    food_id = _FOOD_EXACT.get(food_name)
+    if food_id is None:
+        for candidate_id, name_lower in _FOOD_NAME_LOWER.items():
+            if candidate_id in food_name or food_name in name_lower:
+                food_id = candidate_id
+                break
+    if food_id is not None:
+        food_info = FOOD_DATABASE[food_id]  # read-only below, no copy needed
     
     if not food_info:
         # Generic nutrition analysis for unknown foods
@@ -487,9 +628,16 @@ async def identify_food_nutrition(args: dict[str, Any]) -> list[TextContent]:
     
     return [TextContent(
         type="text",
-        text=json.dumps(analysis, indent=2)
+        text=_dumps(analysis)
     )]
 
+# (protein, carbs, fat) calorie ratios per fitness goal
+_MACRO_RATIOS = {
+    "weight_loss": (0.30, 0.40, 0.30),
+    "muscle_gain": (0.35, 0.45, 0.20),
+    "maintenance": (0.25, 0.50, 0.25)
+}
+
 async def generate_meal_plan(args: dict[str, Any]) -> list[TextContent]:
     """Generate a complete meal plan"""
     daily_calories = args.get("daily_calories", 2000)
@@ -501,18 +649,10 @@ async def generate_meal_plan(args: dict[str, Any]) -> list[TextContent]:
     base_plan = NUTRITION_PLANS.get(fitness_goal, NUTRITION_PLANS["maintenance"])
     
     # Calculate macro targets
-    protein_calories = daily_calories * 0.25
-    carb_calories = daily_calories * 0.50  
-    fat_calories = daily_calories * 0.25
-    
-    if fitness_goal == "muscle_gain":
-        protein_calories = daily_calories * 0.35
-        carb_calories = daily_calories * 0.45
-        fat_calories = daily_calories * 0.20
-    elif fitness_goal == "weight_loss":
-        protein_calories = daily_calories * 0.30
-        carb_calories = daily_calories * 0.40
-        fat_calories = daily_calories * 0.30
+    protein_ratio, carb_ratio, fat_ratio = _MACRO_RATIOS.get(fitness_goal, _MACRO_RATIOS["maintenance"])
+    protein_calories = daily_calories * protein_ratio
+    carb_calories = daily_calories * carb_ratio
+    fat_calories = daily_calories * fat_ratio
     
     meal_plan = {
         "goal": fitness_goal,
@@ -522,7 +662,7 @@ async def generate_meal_plan(args: dict[str, Any]) -> list[TextContent]:
             "carbohydrates": f"{int(carb_calories / 4)}g ({int(carb_calories / daily_calories * 100)}%)",
             "fat": f"{int(fat_calories / 9)}g ({int(fat_calories / daily_calories * 100)}%)"
         },
-        "meals": base_plan["meals"].copy(),
+        "meals": base_plan["meals"],
         "dietary_considerations": dietary_restrictions,
         "hydration": f"Aim for {int(daily_calories / 100)}+ glasses of water daily",
         "meal_timing": {
@@ -540,13 +680,42 @@ async def generate_meal_plan(args: dict[str, Any]) -> list[TextContent]:
     
     return [TextContent(
         type="text",
-        text=json.dumps(meal_plan, indent=2)
+        text=_dumps(meal_plan)
     )]
 
+async def batch_tool_calls(args: dict[str, Any]) -> list[TextContent]:
+    """Run several tool calls concurrently; results are concatenated in call order"""
+    calls = args.get("calls", [])
+    if any(call.get("name") == "batch_tool_calls" for call in calls):
+        raise ValueError("batch_tool_calls cannot be nested")
+    
+    results = await asyncio.gather(*(_run_tool(call.get("name"), call.get("arguments")) for call in calls))
+    return [content for result in results for content in result]
+
+# Tool name -> handler coroutine, used by handle_call_tool
+_TOOL_DISPATCH = {
+    "create_workout_plan": create_workout_plan,
+    "calculate_nutrition_needs": calculate_nutrition_needs,
+    "get_exercise_recommendations": get_exercise_recommendations,
+    "identify_food_nutrition": identify_food_nutrition,
+    "generate_meal_plan": generate_meal_plan,
+    "batch_tool_calls": batch_tool_calls
+}
+
+async def _warm_up():
+    """Run the listing and resource read paths once before serving traffic"""
+    await handle_list_resources()
+    await handle_list_tools()
+    for resource in _RESOURCE_LIST:
+        await handle_read_resource(resource.uri)
+    logger.info("Warm-up complete: %d resources, %d tools", len(_RESOURCE_LIST), len(_TOOL_LIST))
+
 async def main():
     # Import here to avoid issues if mcp package isn't available
     from mcp.server.stdio import stdio_server
     
+    await _warm_up()
+    
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -562,4 +731,12 @@ async def main():
         )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional; it has to provide the loop before main() starts, so it is
+    # passed as the runner's loop factory rather than installed inside main()
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
@@ -10,6 +10,9 @@ Run this ONCE to convert existing plain-text passwords to bcrypt hashes
 
 import sys
 import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Add parent directory to path to import our modules
@@ -23,26 +26,78 @@ load_dotenv()
 
 # Import Azure Search client directly
 from azure.core.credentials import AzureKeyCredential
-from azure.search.documents import SearchClient
+from azure.search.documents import SearchClient, SearchIndexingBufferedSender
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import SearchFieldDataType, SimpleField
 
-class PasswordHasher:
-    """Handles password hashing and verification using bcrypt"""
-    
-    @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash a password using bcrypt"""
-        if not password:
-            raise ValueError("Password cannot be empty")
-        
-        # Generate salt and hash password
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+# Optional progress bar; without it a progress line is printed every PROGRESS_EVERY users
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+PROGRESS_EVERY = 100
+
+# Optional faster JSON serializer for the audit log
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+# One JSON object per user and outcome, appended across runs (inspect with jq or pandas)
+AUDIT_LOG_PATH = os.getenv('MIGRATION_AUDIT_LOG', 'migration.ndjson')
+
+# Only credentials not yet migrated; requires the filterable password_migrated field
+MIGRATION_FILTER = "data_type eq 'user_credentials' and password_migrated ne true"
+CREDENTIALS_FILTER = "data_type eq 'user_credentials'"
+
+def _hash_password_worker(password, _hashpw=bcrypt.hashpw, _gensalt=bcrypt.gensalt):
+    """Process-pool worker: bcrypt-hash one password; returns (hashed, error message, elapsed ms)"""
+    start = time.perf_counter()
+    # Callers only submit non-empty passwords; bcrypt raises ValueError for input it
+    # rejects (e.g. NUL bytes, or more than 72 bytes on bcrypt 5), anything else is a bug
+    try:
+        hashed, error = _hashpw(password.encode('utf-8'), _gensalt()).decode('utf-8'), None
+    except ValueError as e:
+        hashed, error = None, str(e)
+    return hashed, error, round((time.perf_counter() - start) * 1000, 1)
+
+def open_audit_log(path=AUDIT_LOG_PATH):
+    """Open the ndjson audit log for appending (unbuffered fd)"""
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+def audit(fd, email, status, **fields):
+    """Append one audit record; never includes passwords or hashes"""
+    record = {"email": email, "status": status, **fields}
+    if ORJSON_AVAILABLE:
+        line = orjson.dumps(record) + b"\n"
+    else:
+        line = (json.dumps(record) + "\n").encode('utf-8')
+    os.write(fd, line)
+
+def ensure_password_migrated_field(endpoint, index_name, credential):
+    """Add a filterable password_migrated field to the index if it is missing (adding fields is non-destructive)"""
+    try:
+        index_client = SearchIndexClient(endpoint=endpoint, credential=credential)
+        index = index_client.get_index(index_name)
+        field = next((f for f in index.fields if f.name == 'password_migrated'), None)
+        if field is not None:
+            return bool(field.filterable)
         
-        # Return as string for storage
-        return hashed.decode('utf-8')
+        index.fields.append(SimpleField(name="password_migrated", type=SearchFieldDataType.Boolean, filterable=True))
+        index_client.create_or_update_index(index)
+        print("🛠️  Added filterable 'password_migrated' field to the index")
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not check the index schema ({e}); filtering migrated users locally")
+        return False
 
 def migrate_passwords():
     """Migrate all plain-text passwords to bcrypt hashes"""
+    audit_fd = None
     try:
         # Initialize Azure Search client directly
         search_endpoint = os.getenv('AZURE_SEARCH_ENDPOINT')
@@ -68,41 +123,94 @@ def migrate_passwords():
         
         print("🔍 Searching for users with plain-text passwords...")
         
-        # Get all user credentials
-        results = user_data_search_client.search(
+        # Already-migrated users are filtered out by the index itself when it can
+        if ensure_password_migrated_field(search_endpoint, index_name, credential):
+            search_filter = MIGRATION_FILTER
+        else:
+            search_filter = CREDENTIALS_FILTER
+        
+        # Preflight: a count-only query (no documents returned) so steady-state re-runs
+        # skip the paginated scan entirely
+        pending = user_data_search_client.search(
             search_text="*",
-            filter="data_type eq 'user_credentials'",
-            select=["id", "user_email", "password"],
-            top=1000
-        )
+            filter=search_filter,
+            top=0,
+            include_total_count=True
+        ).get_count()
+        if not pending:
+            print("✅ Nothing to do - no users left to migrate")
+            return True
+        
+        # Get user credentials, page by page (no top= cap on the number of users)
+        pages = user_data_search_client.search(
+            search_text="*",
+            filter=search_filter,
+            select=["id", "user_email", "password"]
+        ).by_page()
         
         users_to_update = []
         total_users = 0
+        already_hashed = 0
+        audit_fd = open_audit_log()
+        print(f"📝 Audit log: {AUDIT_LOG_PATH}")
         
-        for result in results:
-            total_users += 1
-            user = dict(result)
-            email = user.get('user_email')
-            password = user.get('password', '')
-            
-            # Check if password is already hashed (bcrypt hashes start with $2b$)
-            if password and not password.startswith('$2b$'):
-                print(f"  📝 Found plain-text password for: {email}")
+        # bcrypt is CPU-bound, so each page's passwords are handed to a process pool
+        # as soon as the page arrives and hash while the next page is fetched
+        print(f"🔐 Hashing on {os.cpu_count()} CPU cores")
+        with ProcessPoolExecutor() as executor:
+            hash_batches = []
+            for page in pages:
+                users_to_hash = []
+                for result in page:
+                    total_users += 1
+                    user = dict(result)
+                    password = user.get('password', '')
+                    
+                    # Check if password is already hashed (bcrypt hashes start with $2b$); still
+                    # needed with the filter, since accounts created after the first migration
+                    # are hashed at signup but never flagged as migrated
+                    if password and not password.startswith('$2b$'):
+                        users_to_hash.append(user)
+                    else:
+                        already_hashed += 1
+                        audit(audit_fd, user.get('user_email'), "already_hashed")
                 
-                # Hash the password
-                try:
-                    hashed = PasswordHasher.hash_password(password)
+                if users_to_hash:
+                    hashed_results = executor.map(
+                        _hash_password_worker,
+                        [user['password'] for user in users_to_hash],
+                        chunksize=16
+                    )
+                    hash_batches.append((users_to_hash, hashed_results))
+            
+            # One progress line instead of a line per user; only errors are printed individually
+            to_hash = sum(len(users_to_hash) for users_to_hash, _ in hash_batches)
+            progress = tqdm(total=to_hash, desc="  🔐 Hashing", unit="user") if TQDM_AVAILABLE else None
+            write = tqdm.write if TQDM_AVAILABLE else print
+            done = 0
+            # One timestamp for the whole batch: every user was migrated in this run
+            migrated_at = datetime.utcnow().isoformat() + "Z"
+            for users_to_hash, hashed_results in hash_batches:
+                for user, (hashed, error, elapsed_ms) in zip(users_to_hash, hashed_results):
+                    done += 1
+                    if progress is not None:
+                        progress.update()
+                    elif done % PROGRESS_EVERY == 0 or done == to_hash:
+                        print(f"  🔐 Hashed {done}/{to_hash}")
+                    
+                    if error:
+                        write(f"  ❌ Error hashing password for {user.get('user_email')}: {error}")
+                        audit(audit_fd, user.get('user_email'), "hash_error", error=error, elapsed_ms=elapsed_ms)
+                        continue
+                    audit(audit_fd, user.get('user_email'), "hashed", elapsed_ms=elapsed_ms)
                     user['password'] = hashed
                     user['password_migrated'] = True
-                    user['password_migrated_at'] = datetime.utcnow().isoformat() + "Z"
+                    user['password_migrated_at'] = migrated_at
                     users_to_update.append(user)
-                    print(f"  ✅ Hashed password for: {email}")
-                except Exception as e:
-                    print(f"  ❌ Error hashing password for {email}: {e}")
-            else:
-                print(f"  ⏭️  Already hashed: {email}")
+            if progress is not None:
+                progress.close()
         
-        print(f"\n📊 Found {total_users} total users")
+        print(f"\n📊 Found {total_users} total users ({already_hashed} already hashed)")
         print(f"🔄 Need to update {len(users_to_update)} users")
         
         if not users_to_update:
@@ -115,18 +223,36 @@ def migrate_passwords():
             print("❌ Migration cancelled")
             return False
         
-        # Update documents in batches
+        # Update documents; the buffered sender batches, splits oversized batches
+        # and retries throttled actions on its own
         print("\n🔄 Updating passwords in Azure Search...")
-        batch_size = 100
+        succeeded = []
+        failed = []
+        
+        def on_progress(action):
+            succeeded.append(action)
+            audit(audit_fd, action.additional_properties.get('user_email'), "updated")
+        
+        def on_error(action):
+            failed.append(action)
+            audit(audit_fd, action.additional_properties.get('user_email'), "update_failed")
         
-        for i in range(0, len(users_to_update), batch_size):
-            batch = users_to_update[i:i + batch_size]
-            try:
-                result = user_data_search_client.merge_documents(batch)
-                success_count = sum(1 for r in result if r.succeeded)
-                print(f"  ✅ Updated batch {i//batch_size + 1}: {success_count}/{len(batch)} succeeded")
-            except Exception as e:
-                print(f"  ❌ Error updating batch: {e}")
+        try:
+            with SearchIndexingBufferedSender(
+                endpoint=search_endpoint,
+                index_name=index_name,
+                credential=credential,
+                auto_flush_interval=60,
+                initial_batch_action_count=500,
+                on_progress=on_progress,
+                on_error=on_error
+            ) as sender:
+                sender.merge_documents(users_to_update)
+            print(f"  ✅ Updated {len(succeeded)}/{len(users_to_update)} users")
+            if failed:
+                print(f"  ❌ Failed to update {len(failed)} users")
+        except Exception as e:
+            print(f"  ❌ Error updating users: {e}")
         
         print("\n🎉 Password migration complete!")
         print("\n⚠️  IMPORTANT NOTES:")
@@ -138,9 +264,11 @@ def migrate_passwords():
         
     except Exception as e:
         print(f"❌ Migration failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
+    finally:
+        if audit_fd is not None:
+            os.close(audit_fd)
 
 if __name__ == "__main__":
     print("=" * 60)
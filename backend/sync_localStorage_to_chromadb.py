@@ -2,91 +2,179 @@
 Script to manually add users to ChromaDB
 Run this after you get the user data from localStorage
 """
-import requests
+import asyncio
+import httpx
 import json
+import os
+import sys
+
+# Optional faster JSON parser for large localStorage exports
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except clauses below cover both
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 API_URL = "http://localhost:5001"  # Backend is running on port 5001
 
-print("=" * 60)
-print("SYNC USERS FROM LOCALSTORAGE TO CHROMADB")
-print("=" * 60)
-print()
-print("Steps to get your localStorage data:")
-print()
-print("1. Open browser where you registered users")
-print("2. Open Developer Console (F12 or Cmd+Option+I on Mac)")
-print("3. Go to Console tab")
-print("4. Run this command:")
-print()
-print("   JSON.stringify(JSON.parse(localStorage.getItem('registeredUsers')))")
-print()
-print("5. Copy the output (the entire JSON array)")
-print("6. Paste it below when prompted")
-print()
-print("=" * 60)
-print()
+# The bulk endpoint only accepts requests carrying the backend's SYNC_API_TOKEN
+SYNC_API_TOKEN = os.getenv("SYNC_API_TOKEN")
+
+# Users go to the bulk endpoint in batches (the server accepts at most 10 per request);
+# a couple of batches run concurrently, bounded so the backend isn't flooded
+BULK_BATCH_SIZE = 10
+SYNC_CONCURRENCY = 2
+
+# The server rate-limits per profile; on 429 a batch waits (Retry-After, else exponential
+# backoff capped at a minute, the limiter's window) and is resent
+MAX_RATE_LIMIT_RETRIES = 6
+RATE_LIMIT_BACKOFF_SECONDS = 5
+
+# Instructions printed at startup (one write instead of a print per line)
+HELP = """\
+============================================================
+SYNC USERS FROM LOCALSTORAGE TO CHROMADB
+============================================================
+
+Steps to get your localStorage data:
+
+1. Open browser where you registered users
+2. Open Developer Console (F12 or Cmd+Option+I on Mac)
+3. Go to Console tab
+4. Run this command:
+
+   JSON.stringify(JSON.parse(localStorage.getItem('registeredUsers')))
+
+5. Copy the output (the entire JSON array)
+6. Paste it below when prompted
+
+============================================================
+
+"""
+
+def build_profile_data(user):
+    """Prepare profile data for backend"""
+    return {
+        'email': user.get('email'),
+        'username': user.get('username'),
+        'name': user.get('name'),
+        'firstName': user.get('firstName', ''),
+        'lastName': user.get('lastName', ''),
+        'age': user.get('age'),
+        'weight': user.get('weight'),
+        'height': user.get('height'),
+        'gender': user.get('gender'),
+        'sex': user.get('gender'),
+        'fitnessLevel': user.get('fitnessLevel'),
+        'agentType': user.get('agentType', 'personal_trainer'),
+        'fitnessAgent': user.get('agentType', 'personal_trainer'),
+        'medicalConditions': user.get('medicalConditions', []),
+        'createdAt': user.get('createdAt'),
+        'isActive': True
+    }
+
+def dedupe_users(users_data):
+    """Drop repeated records for the same email (first one wins) so each user is posted once"""
+    seen = set()
+    unique = []
+    for user in users_data:
+        email = (user.get('email') or '').strip().lower()
+        if email:
+            if email in seen:
+                continue
+            seen.add(email)
+        unique.append(user)
+    return unique
+
+def retry_delay(resp, attempt):
+    """Seconds to wait before resending a rate-limited batch"""
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return min(60, RATE_LIMIT_BACKOFF_SECONDS * 2 ** attempt)
+
+async def sync_batch(client, semaphore, users):
+    """Send a batch of users to the bulk endpoint; returns how many were created"""
+    try:
+        payload = {"users": [build_profile_data(user) for user in users]}
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            async with semaphore:
+                resp = await client.post("/api/bulk-create-user-profiles", json=payload)
+            if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            delay = retry_delay(resp, attempt)
+            print(f"… Rate limited, retrying {len(users)} users in {delay:.0f}s")
+            # Sleep outside the semaphore so other batches keep their slots
+            await asyncio.sleep(delay)
+        
+        if not resp.is_success:
+            for user in users:
+                print(f"✗ Failed: {user.get('email')} - {resp.status_code}")
+            return 0
+        
+        synced = 0
+        for user, result in zip(users, resp.json().get('results', [])):
+            if result.get('success'):
+                print(f"✓ Synced: {user.get('email')} ({user.get('username')})")
+                synced += 1
+            else:
+                print(f"✗ Failed: {user.get('email')} - {result.get('error')}")
+        return synced
+    except Exception as e:
+        for user in users:
+            print(f"✗ Error syncing {user.get('email', 'unknown')}: {e}")
+        return 0
+
+async def sync_all(users_data):
+    """Sync every user in bulk batches over one pooled async client; returns how many were created"""
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+    limits = httpx.Limits(max_connections=SYNC_CONCURRENCY, max_keepalive_connections=SYNC_CONCURRENCY)
+    batches = [users_data[i:i + BULK_BATCH_SIZE] for i in range(0, len(users_data), BULK_BATCH_SIZE)]
+    async with httpx.AsyncClient(
+        base_url=API_URL,
+        headers={"X-Sync-Token": SYNC_API_TOKEN},
+        timeout=120,  # each profile is bcrypt-hashed server side
+        limits=limits,
+        transport=httpx.AsyncHTTPTransport(retries=3, limits=limits)
+    ) as client:
+        return sum(await asyncio.gather(*(sync_batch(client, semaphore, batch) for batch in batches)))
+
+sys.stdout.write(HELP)
 
 # Check if backend is running
 try:
-    test_response = requests.get(f"{API_URL}/health", timeout=2)
+    test_response = httpx.get(f"{API_URL}/health", timeout=2)
     print("✓ Backend server is running")
 except:
     print("✗ ERROR: Backend server is not running!")
     print("  Start it with: python3 app.py")
     exit(1)
 
+if not SYNC_API_TOKEN:
+    print("✗ ERROR: SYNC_API_TOKEN is not set!")
+    print("  Export the same SYNC_API_TOKEN the backend uses, then run this again")
+    exit(1)
+
 print()
 
 response = input("Paste localStorage JSON array (or 'skip' to cancel): ")
 
 if response.lower() != 'skip' and response.strip():
     try:
-        users_data = json.loads(response)
+        users_data = json_loads(response)
         print(f"\nFound {len(users_data)} users in localStorage")
-        print()
         
-        synced = 0
-        failed = 0
+        unique_users = dedupe_users(users_data)
+        if len(unique_users) < len(users_data):
+            print(f"Skipping {len(users_data) - len(unique_users)} duplicate records (same email)")
+        users_data = unique_users
+        print()
         
-        for user in users_data:
-            try:
-                # Prepare profile data for backend
-                profile_data = {
-                    'email': user.get('email'),
-                    'username': user.get('username'),
-                    'name': user.get('name'),
-                    'firstName': user.get('firstName', ''),
-                    'lastName': user.get('lastName', ''),
-                    'age': user.get('age'),
-                    'weight': user.get('weight'),
-                    'height': user.get('height'),
-                    'gender': user.get('gender'),
-                    'sex': user.get('gender'),
-                    'fitnessLevel': user.get('fitnessLevel'),
-                    'agentType': user.get('agentType', 'personal_trainer'),
-                    'fitnessAgent': user.get('agentType', 'personal_trainer'),
-                    'medicalConditions': user.get('medicalConditions', []),
-                    'createdAt': user.get('createdAt'),
-                    'isActive': True
-                }
-                
-                # Send to backend
-                resp = requests.post(
-                    f"{API_URL}/api/create-user-profile",
-                    json=profile_data,
-                    headers={'Content-Type': 'application/json'}
-                )
-                
-                if resp.ok:
-                    print(f"✓ Synced: {user.get('email')} ({user.get('username')})")
-                    synced += 1
-                else:
-                    print(f"✗ Failed: {user.get('email')} - {resp.status_code}")
-                    failed += 1
-                    
-            except Exception as e:
-                print(f"✗ Error syncing {user.get('email', 'unknown')}: {e}")
-                failed += 1
+        synced = asyncio.run(sync_all(users_data))
+        failed = len(users_data) - synced
         
         print()
         print("=" * 60)
@@ -4,27 +4,43 @@ This will help migrate users that were registered when backend was down
 """
 import chromadb
 import json
+import sys
+
+# Optional faster JSON parser for large localStorage exports
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except clauses below cover both
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 # Example users from localStorage - you'll need to paste the actual data
 # Get this from browser console: localStorage.getItem('registeredUsers')
 
-print("=" * 60)
-print("LOCALSTORAGE TO CHROMADB SYNC UTILITY")
-print("=" * 60)
-print()
-print("To sync users from localStorage to ChromaDB:")
-print()
-print("1. Open your browser where you registered users")
-print("2. Open Developer Console (F12 or Cmd+Option+I)")
-print("3. Run this command:")
-print()
-print("   localStorage.getItem('registeredUsers')")
-print()
-print("4. Copy the output")
-print("5. Paste it when prompted below")
-print()
-print("=" * 60)
-print()
+# Instructions printed at startup (one write instead of a print per line)
+HELP = """\
+============================================================
+LOCALSTORAGE TO CHROMADB SYNC UTILITY
+============================================================
+
+To sync users from localStorage to ChromaDB:
+
+1. Open your browser where you registered users
+2. Open Developer Console (F12 or Cmd+Option+I)
+3. Run this command:
+
+   localStorage.getItem('registeredUsers')
+
+4. Copy the output
+5. Paste it when prompted below
+
+============================================================
+
+"""
+
+sys.stdout.write(HELP)
 
 # Check current ChromaDB state
 client = chromadb.PersistentClient(path="./chroma_db")
@@ -38,19 +54,15 @@ response = input("Do you want to paste localStorage data to sync? (yes/no): ")
 
 if response.lower() == 'yes':
     print()
-    print("Paste the localStorage data (the JSON array) and press Enter twice:")
+    print("Paste the localStorage data (the JSON array), then press Ctrl-D (EOF):")
     print()
     
-    lines = []
-    while True:
-        line = input()
-        if line == "":
-            break
-        lines.append(line)
+    # Read the whole paste at once; blank lines in pretty-printed JSON no longer cut it short
+    raw = sys.stdin.read()
     
-    if lines:
+    if raw.strip():
         try:
-            data = json.loads(''.join(lines))
+            data = json_loads(raw)
             print()
             print(f"Found {len(data)} users in localStorage")
             print()
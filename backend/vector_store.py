@@ -5,10 +5,147 @@ App Store Compatible - runs on your backend server
 """
 
 import chromadb
-from chromadb.utils import embedding_functions
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+from functools import cached_property, lru_cache, reduce
+import hashlib
 import json
 from datetime import datetime
+import numpy as np
 import os
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Number of exercises sent to ChromaDB per add() call
+EXERCISE_BATCH_SIZE = 512
+
+# HNSW settings only apply when a collection is created; existing collections keep theirs
+# until recreated (for exercises: run load_exercises.py and answer "yes" to reload).
+# Embeddings are normalized, so cosine ranks like l2 but gives 1 - similarity as distance
+EXERCISE_COLLECTION_METADATA = {
+    "description": "Exercise database for RAG recommendations",
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 200,
+    "hnsw:M": 32,
+    "hnsw:search_ef": 64,
+}
+
+# Few user profiles, so fewer graph links per node keeps the index small
+USER_COLLECTION_METADATA = {
+    "description": "User fitness profiles",
+    "hnsw:space": "cosine",
+    "hnsw:M": 8,
+}
+
+# Exercise metadata fields the get_exercises_by_* helpers filter on; each gets an inverted index
+EXERCISE_INDEXED_FIELDS = ('body_part', 'equipment', 'level')
+
+# Documents per ONNX forward pass when embedding documents in bulk
+CORPUS_EMBED_BATCH_SIZE = 128
+
+# CSV load pipeline: batches embedded in parallel (each ONNX session call is single-threaded)
+# and how many parsed batches may wait for embedding/writing before parsing pauses
+EXERCISE_EMBED_WORKERS = 2
+EXERCISE_PIPELINE_DEPTH = 4
+
+class _SharedDefaultEmbeddingFunction(ONNXMiniLM_L6_V2):
+    """
+    ChromaDB's default embedding function (all-MiniLM-L6-v2 on ONNX), loaded once
+    DefaultEmbeddingFunction builds a new ONNXMiniLM_L6_V2 (tokenizer + InferenceSession)
+    on every call; this reports the same name ("default") so existing collections still
+    match, but keeps one model for the whole process. The session runs single-threaded
+    so concurrent web workers embedding at once don't oversubscribe the CPU
+    """
+    
+    @staticmethod
+    def name():
+        return "default"
+    
+    def default_space(self):
+        # Same distance as DefaultEmbeddingFunction, so new collections are unchanged
+        return "l2"
+    
+    def get_config(self):
+        return {}
+    
+    @staticmethod
+    def build_from_config(config):
+        return _EMBED_FN
+    
+    def embed_corpus(self, documents):
+        """Embed every document in one pass; returns a normalized (N, 384) float32 array"""
+        self._download_model_if_not_exists()
+        return self._forward(documents, batch_size=CORPUS_EMBED_BATCH_SIZE)
+    
+    @cached_property
+    def model(self):
+        so = self.ort.SessionOptions()
+        so.log_severity_level = 3
+        so.graph_optimization_level = self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.intra_op_num_threads = 1
+        so.inter_op_num_threads = 1
+        return self.ort.InferenceSession(
+            os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx"),
+            providers=self._preferred_providers,
+            sess_options=so,
+        )
+
+# Process-wide embedding function shared by every collection (and every FitnessVectorStore)
+_EMBED_FN = _SharedDefaultEmbeddingFunction(preferred_providers=["CPUExecutionProvider"])
+
+# Search queries repeat a lot ("chest exercises", the goal queries), so their vectors are cached
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_query(text):
+    """Embedding of a search query as a read-only float32 array (~1.5 KB per cache entry)
+    Every collection uses _EMBED_FN, so the query text alone is the key; callers must not mutate it"""
+    embedding = np.array(_EMBED_FN([text])[0], dtype=np.float32)
+    embedding.setflags(write=False)
+    return embedding
+
+class _ExerciseMatrix(NamedTuple):
+    """In-process copy of the exercise collection used by search_exercises"""
+    # (N, 384) float32, unit rows. Deliberately not int8: numpy has no BLAS path for integer
+    # matmuls, so a quantized matrix scores several times slower than float32 sgemv, and the
+    # whole float32 corpus is only a few MB
+    embeddings: np.ndarray
+    documents: list
+    metadatas: list
+    indexes: dict           # field -> {value: sorted int32 row indexes}
+
+def _top_k(query, matrix, k):
+    """Row indexes of the k best-scoring rows (dot product with query), best first, and all scores
+    Rows and query are unit vectors, so the score is their cosine similarity"""
+    scores = matrix @ query
+    if k < len(scores):
+        idx = np.argpartition(-scores, k)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx])], scores
+
+def _dumps(obj):
+    """Compact JSON string, serialized once and reused for both the document and metadata"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+def _uuid7(unix_ms):
+    """UUIDv7 string: 48-bit Unix ms timestamp + random bits, so ids sort by creation time
+    and concurrent writes in the same millisecond don't collide"""
+    value = (unix_ms << 80) | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
 
 class FitnessVectorStore:
     def __init__(self, persist_directory=None):
@@ -34,14 +171,14 @@ class FitnessVectorStore:
         print(f"📦 Vector store location: {persist_directory}")
         
         # Use default embedding function (sentence-transformers)
-        # This runs locally, no API calls
-        self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        # This runs locally, no API calls; the model is loaded once per process
+        self.embedding_fn = _EMBED_FN
         
         # Create collections
         self.users_collection = self.client.get_or_create_collection(
             name="fitness_users",
             embedding_function=self.embedding_fn,
-            metadata={"description": "User fitness profiles"}
+            metadata=USER_COLLECTION_METADATA
         )
         
         self.workouts_collection = self.client.get_or_create_collection(
@@ -59,14 +196,17 @@ class FitnessVectorStore:
         self.exercise_collection = self.client.get_or_create_collection(
             name="exercise_database",
             embedding_function=self.embedding_fn,
-            metadata={"description": "Exercise database for RAG recommendations"}
+            metadata=EXERCISE_COLLECTION_METADATA
         )
         
+        # _ExerciseMatrix of the exercise corpus, loaded on first search
+        self._exercise_cache = None
+        
         print("✅ Vector store initialized (local, App Store compatible)")
         print(f"📊 Exercise collection count: {self.exercise_collection.count()}")
     
-    def store_user_profile(self, user_data):
-        """Store user profile with semantic search capability (including password if provided)"""
+    def _user_profile_record(self, user_data):
+        """Build the (id, searchable text, metadata) ChromaDB stores for a user profile"""
         email = user_data.get('email')
         
         # Handle medicalConditions - convert list to string or keep as is
@@ -77,46 +217,90 @@ class FitnessVectorStore:
             medical_conditions_text = str(medical_conditions)
         
         # Create searchable text
-        profile_text = f"""
-        User: {user_data.get('username')} ({user_data.get('firstName')} {user_data.get('middleName', '')} {user_data.get('lastName')})
-        Age: {user_data.get('age')}, Gender: {user_data.get('gender')}
-        Weight: {user_data.get('weight')} lbs, Height: {user_data.get('height')} inches
-        Fitness Level: {user_data.get('fitnessLevel')}
-        Coach Type: {user_data.get('agentType')}
-        Medical Conditions: {medical_conditions_text}
-        """.strip()
+        profile_text = "\n".join((
+            f"User: {user_data.get('username')} ({user_data.get('firstName')} {user_data.get('middleName', '')} {user_data.get('lastName')})",
+            f"Age: {user_data.get('age')}, Gender: {user_data.get('gender')}",
+            f"Weight: {user_data.get('weight')} lbs, Height: {user_data.get('height')} inches",
+            f"Fitness Level: {user_data.get('fitnessLevel')}",
+            f"Coach Type: {user_data.get('agentType')}",
+            f"Medical Conditions: {medical_conditions_text}",
+        ))
         
         # Create metadata - ensure medicalConditions is a string
         metadata = dict(user_data)
         metadata['medicalConditions'] = medical_conditions_text
         metadata['created_at'] = datetime.utcnow().isoformat()
         metadata['type'] = 'user_profile'
+        # Lets store_user_profile tell whether the embedded text changed
+        metadata['profile_hash'] = hashlib.blake2b(profile_text.encode(), digest_size=16).hexdigest()
         # Password is stored in metadata (hashed) if provided
         if 'password' in user_data:
             metadata['password'] = user_data['password']
         
-        # Store with metadata
-        self.users_collection.upsert(
-            documents=[profile_text],
-            metadatas=[metadata],
-            ids=[email]
-        )
+        return email, profile_text, metadata
+    
+    def store_user_profile(self, user_data):
+        """Store user profile with semantic search capability (including password if provided)"""
+        email, profile_text, metadata = self._user_profile_record(user_data)
+        
+        existing = self.users_collection.get(ids=[email], include=["metadatas"])
+        if existing['ids'] and existing['metadatas'][0].get('profile_hash') == metadata['profile_hash']:
+            # Profile text unchanged (e.g. only the password moved), keep the stored embedding
+            self.users_collection.update(
+                metadatas=[metadata],
+                ids=[email]
+            )
+        else:
+            # Store with metadata
+            self.users_collection.upsert(
+                documents=[profile_text],
+                embeddings=_EMBED_FN([profile_text]),
+                metadatas=[metadata],
+                ids=[email]
+            )
         
         print(f"✅ User profile stored: {email}")
         return True
     
+    def existing_user_emails(self, emails):
+        """The subset of emails that already have a stored profile"""
+        if not emails:
+            return set()
+        return set(self.users_collection.get(ids=list(emails), include=[])['ids'])
+    
+    def store_user_profiles(self, users):
+        """Store several new user profiles with one add (one embedding batch)
+        Ids that already exist are left untouched by ChromaDB, so this never overwrites an account"""
+        ids, documents, metadatas = [], [], []
+        for user_data in users:
+            email, profile_text, metadata = self._user_profile_record(user_data)
+            ids.append(email)
+            documents.append(profile_text)
+            metadatas.append(metadata)
+        
+        self.users_collection.add(
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids
+        )
+        
+        print(f"✅ {len(ids)} user profiles stored")
+        return True
+    
     def store_workout_plan(self, email, workout_plan):
         """Store workout plan for semantic search"""
-        plan_id = f"{email}_{datetime.utcnow().timestamp()}"
+        created_ms = time.time_ns() // 1_000_000
+        plan_id = f"{email}_{_uuid7(created_ms)}"
         
-        plan_text = f"Workout plan for {email}: {json.dumps(workout_plan)}"
+        plan_json = _dumps(workout_plan)
+        plan_text = f"Workout plan for {email}: {plan_json}"
         
         self.workouts_collection.add(
             documents=[plan_text],
             metadatas=[{
                 'email': email,
-                'plan': json.dumps(workout_plan),
-                'created_at': datetime.utcnow().isoformat(),
+                'plan': plan_json,
+                'created_at': created_ms,
                 'type': 'workout_plan'
             }],
             ids=[plan_id]
@@ -126,16 +310,18 @@ class FitnessVectorStore:
     
     def store_food_recommendation(self, email, recommendation):
         """Store food recommendation"""
-        rec_id = f"{email}_{datetime.utcnow().timestamp()}"
+        created_ms = time.time_ns() // 1_000_000
+        rec_id = f"{email}_{_uuid7(created_ms)}"
         
-        rec_text = f"Food recommendation for {email}: {json.dumps(recommendation)}"
+        rec_json = _dumps(recommendation)
+        rec_text = f"Food recommendation for {email}: {rec_json}"
         
         self.food_collection.add(
             documents=[rec_text],
             metadatas=[{
                 'email': email,
-                'recommendation': json.dumps(recommendation),
-                'created_at': datetime.utcnow().isoformat(),
+                'recommendation': rec_json,
+                'created_at': created_ms,
                 'type': 'food_recommendation'
             }],
             ids=[rec_id]
@@ -148,11 +334,12 @@ class FitnessVectorStore:
         # Use email as ID so each user only has one current weekly plan
         plan_id = f"weekly_plan_{email}"
         
-        plan_text = f"Weekly fitness plan for {email}: {json.dumps(weekly_plan)}"
+        plan_json = _dumps(weekly_plan)
+        plan_text = f"Weekly fitness plan for {email}: {plan_json}"
         
         metadata = {
             'email': email,
-            'plan': json.dumps(weekly_plan),
+            'plan': plan_json,
             'created_at': datetime.utcnow().isoformat(),
             'type': 'weekly_plan'
         }
@@ -171,7 +358,7 @@ class FitnessVectorStore:
         """Get the weekly fitness plan for a user from ChromaDB"""
         plan_id = f"weekly_plan_{email}"
         try:
-            result = self.workouts_collection.get(ids=[plan_id])
+            result = self.workouts_collection.get(ids=[plan_id], include=["metadatas"])
             if result['ids'] and result['metadatas']:
                 metadata = result['metadatas'][0]
                 return json.loads(metadata['plan'])
@@ -195,7 +382,7 @@ class FitnessVectorStore:
     def get_user_by_email(self, email):
         """Get user profile by exact email match"""
         try:
-            result = self.users_collection.get(ids=[email])
+            result = self.users_collection.get(ids=[email], include=["metadatas"])
             if result['ids']:
                 return result['metadatas'][0]
             return None
@@ -206,7 +393,8 @@ class FitnessVectorStore:
     def get_user_by_username(self, username):
         """Get user by username"""
         results = self.users_collection.get(
-            where={"username": username}
+            where={"username": username},
+            include=["metadatas"]
         )
         
         if results['ids']:
@@ -216,8 +404,9 @@ class FitnessVectorStore:
     def semantic_search_users(self, query, n_results=5):
         """Semantic search across user profiles"""
         results = self.users_collection.query(
-            query_texts=[query],
-            n_results=n_results
+            query_embeddings=[_embed_query(query).tolist()],
+            n_results=n_results,
+            include=["metadatas", "distances"]
         )
         
         return {
@@ -228,7 +417,8 @@ class FitnessVectorStore:
     def get_user_workout_plans(self, email, n_results=10):
         """Get all workout plans for a user"""
         results = self.workouts_collection.get(
-            where={"email": email}
+            where={"email": email},
+            include=["metadatas"]
         )
         
         return results['metadatas'] if results['metadatas'] else []
@@ -236,7 +426,8 @@ class FitnessVectorStore:
     def get_user_food_recommendations(self, email, n_results=10):
         """Get all food recommendations for a user"""
         results = self.food_collection.get(
-            where={"email": email}
+            where={"email": email},
+            include=["metadatas"]
         )
         
         return results['metadatas'] if results['metadatas'] else []
@@ -246,9 +437,10 @@ class FitnessVectorStore:
         where_filter = {"email": email} if email else None
         
         results = self.workouts_collection.query(
-            query_texts=[query],
+            query_embeddings=[_embed_query(query).tolist()],
             n_results=n_results,
-            where=where_filter
+            where=where_filter,
+            include=["metadatas"]
         )
         
         return results['metadatas'][0] if results['metadatas'] else []
@@ -259,13 +451,13 @@ class FitnessVectorStore:
             # Delete user profile
             self.users_collection.delete(ids=[email])
             
-            # Delete workouts
-            workouts = self.workouts_collection.get(where={"email": email})
+            # Delete workouts (only the ids are needed)
+            workouts = self.workouts_collection.get(where={"email": email}, include=[])
             if workouts['ids']:
                 self.workouts_collection.delete(ids=workouts['ids'])
             
             # Delete food recommendations
-            food_recs = self.food_collection.get(where={"email": email})
+            food_recs = self.food_collection.get(where={"email": email}, include=[])
             if food_recs['ids']:
                 self.food_collection.delete(ids=food_recs['ids'])
             
@@ -289,75 +481,102 @@ class FitnessVectorStore:
         import csv
         print(f"📥 Loading exercises from {csv_path}")
         
+        csv_fields = ('Title', 'Desc', 'Type', 'BodyPart', 'Equipment', 'Level', 'Rating', 'RatingDesc')
+        
+        def write_exercises(embedded, documents, metadatas, ids):
+            """Runs on the single writer thread, so adds happen one at a time and in CSV order"""
+            nonlocal loaded
+            self.exercise_collection.add(
+                documents=documents,
+                embeddings=embedded.result(),
+                metadatas=metadatas,
+                ids=ids
+            )
+            loaded += len(ids)
+            print(f"  ✅ Loaded {loaded} exercises...")
+        
+        loaded = 0
+        
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            # Parse on this thread while earlier batches are embedded and written in the background
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f, \
+                    ThreadPoolExecutor(max_workers=EXERCISE_EMBED_WORKERS, thread_name_prefix="exercise-embed") as embed_pool, \
+                    ThreadPoolExecutor(max_workers=1, thread_name_prefix="exercise-write") as write_pool:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                column_index = {name: i for i, name in enumerate(header)}
+                field_indexes = [column_index.get(name) for name in csv_fields]
+                
+                in_flight = deque()
+                
+                def flush(documents, metadatas, ids):
+                    embedded = embed_pool.submit(_EMBED_FN.embed_corpus, documents)
+                    in_flight.append(write_pool.submit(write_exercises, embedded, documents, metadatas, ids))
+                    if len(in_flight) > EXERCISE_PIPELINE_DEPTH:
+                        in_flight.popleft().result()
+                
+                # Collect columnar lists straight from the raw rows (no per-row dicts)
                 exercises = []
                 metadatas = []
                 ids = []
                 
                 for idx, row in enumerate(reader):
-                    # Create searchable text combining all fields
-                    title = row.get('Title', '').strip()
-                    desc = row.get('Desc', '').strip()
-                    exercise_type = row.get('Type', '').strip()
-                    body_part = row.get('BodyPart', '').strip()
-                    equipment = row.get('Equipment', '').strip()
-                    level = row.get('Level', '').strip()
+                    row_len = len(row)
+                    title, desc, exercise_type, body_part, equipment, level, rating, rating_desc = (
+                        row[i] if i is not None and i < row_len else '' for i in field_indexes
+                    )
                     
+                    # Create searchable text combining all fields
+                    title = title.strip()
                     if not title:  # Skip empty rows
                         continue
                     
+                    desc = desc.strip()
+                    exercise_type = exercise_type.strip()
+                    body_part = body_part.strip()
+                    equipment = equipment.strip()
+                    level = level.strip()
+                    
                     # Create rich searchable text
-                    searchable_text = f"""
-                    Exercise: {title}
-                    Description: {desc}
-                    Type: {exercise_type}
-                    Body Part: {body_part}
-                    Equipment: {equipment}
-                    Level: {level}
-                    """.strip()
+                    searchable_text = "\n".join((
+                        f"Exercise: {title}",
+                        f"Description: {desc}",
+                        f"Type: {exercise_type}",
+                        f"Body Part: {body_part}",
+                        f"Equipment: {equipment}",
+                        f"Level: {level}",
+                    ))
                     
-                    # Create metadata
-                    metadata = {
+                    exercises.append(searchable_text)
+                    metadatas.append({
                         'title': title,
                         'description': desc,
                         'type': exercise_type,
                         'body_part': body_part,
                         'equipment': equipment,
                         'level': level,
-                        'rating': row.get('Rating', ''),
-                        'rating_desc': row.get('RatingDesc', '')
-                    }
-                    
-                    exercises.append(searchable_text)
-                    metadatas.append(metadata)
+                        'rating': rating,
+                        'rating_desc': rating_desc
+                    })
                     ids.append(f"exercise_{idx}")
                     
-                    # Batch insert every 100 exercises
-                    if len(exercises) >= 100:
-                        self.exercise_collection.add(
-                            documents=exercises,
-                            metadatas=metadatas,
-                            ids=ids
-                        )
-                        print(f"  ✅ Loaded {len(ids)} exercises...")
-                        exercises = []
-                        metadatas = []
-                        ids = []
+                    if len(ids) == EXERCISE_BATCH_SIZE:
+                        flush(exercises, metadatas, ids)
+                        exercises, metadatas, ids = [], [], []
                 
-                # Insert remaining exercises
-                if exercises:
-                    self.exercise_collection.add(
-                        documents=exercises,
-                        metadatas=metadatas,
-                        ids=ids
-                    )
-                    print(f"  ✅ Loaded final {len(ids)} exercises")
+                if ids:
+                    flush(exercises, metadatas, ids)
                 
-                total = self.exercise_collection.count()
-                print(f"✅ Successfully loaded {total} exercises into ChromaDB")
-                return True
+                # Surface any embedding/write error before reporting success
+                for future in in_flight:
+                    future.result()
+            
+            # Next search reloads the in-process exercise matrix
+            self._exercise_cache = None
+            
+            total = self.exercise_collection.count()
+            print(f"✅ Successfully loaded {total} exercises into ChromaDB")
+            return True
                 
         except Exception as e:
             print(f"❌ Error loading exercises: {e}")
@@ -365,6 +584,61 @@ class FitnessVectorStore:
             traceback.print_exc()
             return False
     
+    def _exercise_matrix(self):
+        """
+        Exercise embeddings as one (N, 384) float32 matrix, plus documents, metadatas and
+        inverted indexes over EXERCISE_INDEXED_FIELDS
+        The corpus is small and only changes on reload, so searches score it in process
+        instead of going through HNSW; returns None while the collection is empty
+        """
+        if self._exercise_cache is None:
+            data = self.exercise_collection.get(include=["embeddings", "documents", "metadatas"])
+            if len(data['ids']) == 0:
+                return None
+            
+            postings = {field: {} for field in EXERCISE_INDEXED_FIELDS}
+            for i, metadata in enumerate(data['metadatas']):
+                for field, index in postings.items():
+                    index.setdefault(metadata.get(field), []).append(i)
+            indexes = {
+                field: {value: np.array(rows, dtype=np.int32) for value, rows in index.items()}
+                for field, index in postings.items()
+            }
+            
+            self._exercise_cache = _ExerciseMatrix(
+                np.ascontiguousarray(data['embeddings'], dtype=np.float32),
+                data['documents'],
+                data['metadatas'],
+                indexes
+            )
+        return self._exercise_cache
+    
+    def _search_exercise_matrix(self, matrix, query, where_filter, top_k):
+        """Cosine top-k over the cached exercise matrix, restricted to rows matching where_filter"""
+        embeddings, documents, metadatas, indexes = matrix
+        if where_filter:
+            # Intersect the indexed fields' row lists, then check any other fields row by row
+            indexed = [indexes[key].get(value, np.empty(0, dtype=np.int32))
+                       for key, value in where_filter.items() if key in indexes]
+            rows = reduce(np.intersect1d, indexed) if indexed else np.arange(len(metadatas))
+            unindexed = {key: value for key, value in where_filter.items() if key not in indexes}
+            if unindexed:
+                rows = np.array([i for i in rows
+                                 if all(metadatas[i].get(key) == value for key, value in unindexed.items())],
+                                dtype=np.int32)
+            candidates = embeddings[rows]
+        else:
+            rows = np.arange(len(metadatas))
+            candidates = embeddings
+        
+        query_embedding = _embed_query(query)
+        best, scores = _top_k(query_embedding, candidates, top_k)
+        return [{
+            'content': documents[rows[i]],
+            'metadata': metadatas[rows[i]],
+            'distance': float(1.0 - scores[i])
+        } for i in best]
+    
     def search_exercises(self, query, filters=None, top_k=10):
         """
         Search exercises using semantic similarity
@@ -382,22 +656,27 @@ class FitnessVectorStore:
                     if value:
                         where_filter[key] = value
             
-            results = self.exercise_collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                where=where_filter if where_filter else None
-            )
-            
-            # Format results
-            exercises = []
-            if results['documents'] and results['documents'][0]:
-                for i in range(len(results['documents'][0])):
-                    exercise = {
-                        'content': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i],
-                        'distance': results['distances'][0][i] if 'distances' in results else None
-                    }
-                    exercises.append(exercise)
+            matrix = self._exercise_matrix()
+            if matrix is not None:
+                exercises = self._search_exercise_matrix(matrix, query, where_filter, top_k)
+            else:
+                results = self.exercise_collection.query(
+                    query_embeddings=[_embed_query(query).tolist()],
+                    n_results=top_k,
+                    where=where_filter if where_filter else None,
+                    include=["documents", "metadatas", "distances"]
+                )
+                
+                # Format results
+                exercises = []
+                if results['documents'] and results['documents'][0]:
+                    for i in range(len(results['documents'][0])):
+                        exercise = {
+                            'content': results['documents'][0][i],
+                            'metadata': results['metadatas'][0][i],
+                            'distance': results['distances'][0][i] if 'distances' in results else None
+                        }
+                        exercises.append(exercise)
             
             print(f"🔍 Found {len(exercises)} exercises for query: '{query}'")
             return exercises
@@ -440,5 +719,32 @@ class FitnessVectorStore:
         
         return self.search_exercises(query, filters, top_k)
 
-# Singleton instance
-vector_store = FitnessVectorStore()
+class _LazyFitnessVectorStore:
+    """
+    Stand-in for the shared FitnessVectorStore, built on first attribute access
+    Importing this module no longer opens ChromaDB; the first caller pays that once
+    """
+    _instance = None
+    _lock = threading.Lock()
+    
+    def _get(self):
+        cls = type(self)
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = FitnessVectorStore()
+        return cls._instance
+    
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+def warm_up():
+    """Open the store, load the embedding model and the exercise matrix before the first request"""
+    _EMBED_FN(["warm up"])
+    vector_store._exercise_matrix()
+
+# Singleton instance (lazy)
+vector_store = _LazyFitnessVectorStore()
@@ -1589,6 +1589,9 @@ def create_user_data_index():
             SimpleField(name="agent_type", type=SearchFieldDataType.String, filterable=True),
             SimpleField(name="medical_conditions", type=SearchFieldDataType.Collection(SearchFieldDataType.String), searchable=True),
             SimpleField(name="is_active", type=SearchFieldDataType.Boolean, filterable=True),
+            
+            # Set by migrate_passwords.py; filterable so re-runs only fetch unmigrated credentials
+            SimpleField(name="password_migrated", type=SearchFieldDataType.Boolean, filterable=True),
         ]
         
         index = SearchIndex(name=USER_DATA_INDEX, fields=fields)